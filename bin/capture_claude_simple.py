@@ -9,12 +9,177 @@ import sys
 import time
 import os
 import shlex
+import shutil
+import signal
+import json
+import hashlib
+import contextlib
+import tempfile
+import threading
+import logging
 import platform
 from pathlib import Path
-from datetime import datetime
 
 
-def capture_claude_print(prompt, path=".", timeout=300, verbose=False, skip_permissions=False):
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Resolve claude once at import
+_CLAUDE_PATH = shutil.which("claude") or (
+    "claude" if _IS_WINDOWS else os.path.expanduser("~/.npm-global/bin/claude")
+)
+
+logger = logging.getLogger('cc_enhancer.capture')
+
+# Successful responses are cached here, keyed by prompt, path and the state of that path
+_CACHE_DIR = Path.home() / ".cache" / "cc_enhancer"
+_CACHE_MAX_AGE = 24 * 60 * 60  # Seconds a cached response stays usable
+
+
+def _directory_state(cwd):
+    """Return the HEAD commit at cwd (if it is in a git repository) and cwd's mtime."""
+    try:
+        head = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        head = ''  # No git
+    return f"{head}:{os.stat(cwd).st_mtime_ns}"
+
+
+def _cache_file(prompt, cwd):
+    """Return the cache file for a prompt run in absolute directory cwd, as that directory is now."""
+    key = hashlib.blake2b(
+        prompt.encode('utf-8') + b'\0' + cwd.encode('utf-8') + b'\0' + _directory_state(cwd).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+    return _CACHE_DIR / f"{key}.txt"
+
+
+def _read_cache(cache_file):
+    """Return the cached response in cache_file, or None if there is none or it has expired."""
+    try:
+        if time.time() - cache_file.stat().st_mtime > _CACHE_MAX_AGE:
+            return None
+        return cache_file.read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+
+def _prune_cache():
+    """Delete expired responses, so the cache directory doesn't grow forever."""
+    cutoff = time.time() - _CACHE_MAX_AGE
+    try:
+        for entry in os.scandir(_CACHE_DIR):
+            if entry.name.endswith('.txt') and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+    except OSError:
+        pass
+
+
+def _write_cache(cache_file, output):
+    """Atomically store a response so concurrent readers never see a partial file; failing to cache is harmless."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(output)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _enable_verbose_logging():
+    """Send this module's debug messages to stderr (idempotent)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+
+def _claude_command(args):
+    """Return the argv that runs claude with args."""
+    if _IS_WINDOWS and not _CLAUDE_PATH.lower().endswith('.exe'):
+        # npm installs claude.cmd, which Windows would run through cmd.exe: that
+        # interprets & | < > ^ % in the prompt and cuts it at the first newline.
+        # git-bash takes the whole quoted command line intact.
+        git_bash = os.environ.get('CLAUDE_CODE_GIT_BASH_PATH', r'C:\Program Files\Git\bin\bash.exe')
+        return [git_bash, '-c', shlex.join(['claude', *args])]
+    # The prompt is its own argv element, no shell involved
+    return [_CLAUDE_PATH, *args]
+
+
+def claude_print_command(prompt, skip_permissions=False):
+    """Return the argv for a one-shot `claude --print` run of prompt."""
+    args = ['--print']
+    if skip_permissions:
+        args.append('--dangerously-skip-permissions')
+    args.append(prompt)
+    return _claude_command(args)
+
+
+def _kill_process_tree(proc):
+    """Kill proc and, on POSIX, everything in its process group (e.g. helpers holding its stdout)."""
+    if _IS_WINDOWS:
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _run_streaming(cmd, cwd, timeout, stream):
+    """
+    Run cmd, copying its stdout to stream line by line as it arrives.
+    
+    Returns a CompletedProcess like subprocess.run(capture_output=True, text=True).
+    Raises subprocess.TimeoutExpired if it runs longer than timeout.
+    """
+    # stderr goes to a temp file rather than a pipe, so a chatty stderr can't
+    # fill up and stall claude while we are blocked reading stdout
+    with tempfile.TemporaryFile(mode='w+') as err, subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=err,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+        start_new_session=not _IS_WINDOWS  # Its own process group, so helpers it starts can be killed too
+    ) as proc:
+        # Reading stdout blocks, so a timer enforces the timeout
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            _kill_process_tree(proc)
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            collected = []
+            for line in proc.stdout:
+                stream.write(line)
+                stream.flush()
+                collected.append(line)
+            proc.wait()
+        finally:
+            timer.cancel()
+            # Don't leave claude running (and Popen waiting on it) if writing to stream failed
+            if proc.poll() is None:
+                _kill_process_tree(proc)
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, output=''.join(collected))
+        err.seek(0)
+        return subprocess.CompletedProcess(cmd, proc.returncode, ''.join(collected), err.read())
+
+
+def capture_claude_print(prompt, path=".", timeout=300, verbose=False, skip_permissions=False, use_cache=False,
+                         stream=None):
     """
     Capture Claude's output using --print mode.
     
@@ -24,83 +189,202 @@ def capture_claude_print(prompt, path=".", timeout=300, verbose=False, skip_perm
         timeout: Maximum time to wait for response
         verbose: Enable verbose output
         skip_permissions: Skip permission prompts (use with caution)
+        use_cache: Reuse a successful response from the last day for the same prompt and
+            path, if the path's HEAD and mtime haven't changed; ignored with skip_permissions
+        stream: File object (e.g. sys.stdout) to copy the response to as it arrives
         
     Returns:
         tuple: (output, return_code)
     """
-    # Validate path
-    path_obj = Path(path)
-    if not path_obj.exists():
+    if verbose:
+        _enable_verbose_logging()
+    
+    # Validate path once and hand the resolved directory straight to the subprocess
+    cwd = os.path.abspath(path)
+    if not os.path.isdir(cwd):
         raise ValueError(f"Path '{path}' does not exist")
     
-    # Use Windows claude path if on Windows, otherwise use Linux path
-    if platform.system() == "Windows":
-        claude_path = "claude"  # Use claude from PATH on Windows
-    else:
-        claude_path = "/home/laurelin/.npm-global/bin/claude"
+    if use_cache and skip_permissions:
+        # A replayed answer would silently skip the edits the prompt asks for
+        logger.debug("Not using the cache: Claude may change files with --dangerously-skip-permissions")
+        use_cache = False
     
-    if verbose:
-        print(f"[{datetime.now().isoformat()}] Running Claude in print mode", file=sys.stderr)
-        print(f"[{datetime.now().isoformat()}] Prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}", file=sys.stderr)
+    if use_cache:
+        cache_file = _cache_file(prompt, cwd)
+        output = _read_cache(cache_file)
+        if output is not None:
+            logger.debug("Using cached response: %s", cache_file)
+            if stream is not None:
+                stream.write(output)
+                stream.flush()
+            return output, 0
+    
+    logger.debug("Running Claude in print mode")
+    logger.debug("Prompt: %.100s%s", prompt, '...' if len(prompt) > 100 else '')
     
     try:
-        # Build command
-        if platform.system() == "Windows":
-            # On Windows, we need to use git-bash to run claude
-            git_bash = os.environ.get('CLAUDE_CODE_GIT_BASH_PATH', r'C:\Program Files\Git\bin\bash.exe')
-            cmd = [git_bash, '-c', f'claude --print {"--dangerously-skip-permissions" if skip_permissions else ""} {shlex.quote(prompt)}']
-        else:
-            cmd = [claude_path, '--print']
-            if skip_permissions:
-                cmd.append('--dangerously-skip-permissions')
-            cmd.append(prompt)
+        cmd = claude_print_command(prompt, skip_permissions)
         
-        if verbose:
-            print(f"[{datetime.now().isoformat()}] Command: {' '.join(cmd)}", file=sys.stderr)
+        logger.debug("Command: %s", cmd)
         
         # Run Claude with --print flag
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=path,
-            timeout=timeout
-        )
+        if stream is not None:
+            result = _run_streaming(cmd, cwd, timeout, stream)
+        else:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                cwd=cwd,
+                timeout=timeout
+            )
         
-        if verbose:
-            print(f"[{datetime.now().isoformat()}] Claude completed with code: {result.returncode}", file=sys.stderr)
-            if result.stderr:
-                print(f"[{datetime.now().isoformat()}] Stderr: {result.stderr}", file=sys.stderr)
+        logger.debug("Claude completed with code: %s", result.returncode)
+        if result.stderr:
+            logger.debug("Stderr: %s", result.stderr)
+        
+        if use_cache and result.returncode == 0:
+            _prune_cache()
+            _write_cache(cache_file, result.stdout)
         
         return result.stdout, result.returncode
         
     except subprocess.TimeoutExpired:
-        if verbose:
-            print(f"[{datetime.now().isoformat()}] Claude timed out after {timeout} seconds", file=sys.stderr)
+        logger.debug("Claude timed out after %s seconds", timeout)
         return "", -1
     except Exception as e:
-        if verbose:
-            print(f"[{datetime.now().isoformat()}] Error: {e}", file=sys.stderr)
+        logger.debug("Error: %s", e)
         raise
 
 
+class ClaudeSession:
+    """
+    One long-running claude process that answers prompts in turn.
+    
+    Uses --print with stream-json input and output, so prompts go in as JSON
+    lines on stdin and each answer ends with a "result" event. Saves a claude
+    startup per prompt, but later prompts see the earlier ones as conversation
+    history; use capture_claude_print when each prompt must stand alone.
+    """
+    
+    def __init__(self, path=".", timeout=300, verbose=False, skip_permissions=False):
+        if verbose:
+            _enable_verbose_logging()
+        
+        cwd = os.path.abspath(path)
+        if not os.path.isdir(cwd):
+            raise ValueError(f"Path '{path}' does not exist")
+        
+        args = ['--print', '--input-format', 'stream-json',
+                '--output-format', 'stream-json', '--verbose']
+        if skip_permissions:
+            args.append('--dangerously-skip-permissions')
+        cmd = _claude_command(args)
+        logger.debug("Starting Claude session: %s", cmd)
+        
+        self.timeout = timeout
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # Nobody reads it, so it must not be a pipe
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+            start_new_session=not _IS_WINDOWS  # So kills also reach helpers holding its stdout
+        )
+    
+    def ask(self, prompt):
+        """
+        Send prompt and wait for Claude's answer.
+        
+        Returns:
+            tuple: (output, return_code) like capture_claude_print; -1 on timeout,
+            after which the session is closed
+        """
+        logger.debug("Prompt: %.100s%s", prompt, '...' if len(prompt) > 100 else '')
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+        try:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            logger.debug("Claude session is gone: %s", e)
+            return "", self.proc.poll() or 1
+        
+        # Reading stdout blocks, so a timer enforces the timeout
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            _kill_process_tree(self.proc)
+        
+        timer = threading.Timer(self.timeout, kill)
+        timer.start()
+        try:
+            for line in self.proc.stdout:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("type") == "result":
+                    return event.get("result", ""), 1 if event.get("is_error") else 0
+        finally:
+            timer.cancel()
+        
+        # stdout closed before an answer came: claude exited or was killed
+        code = self.proc.wait()
+        if timed_out.is_set():
+            logger.debug("Claude timed out after %s seconds", self.timeout)
+            return "", -1
+        logger.debug("Claude session ended with code: %s", code)
+        return "", code or 1
+    
+    def close(self):
+        """End the session, giving claude a moment to exit on its own before killing it."""
+        if self.proc.stdin:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        # Also stops any helpers claude left behind
+        _kill_process_tree(self.proc)
+        self.proc.wait()
+
+
+@contextlib.contextmanager
+def capture_claude_session(path=".", timeout=300, verbose=False, skip_permissions=False):
+    """Context manager yielding a ClaudeSession that is closed on exit."""
+    session = ClaudeSession(path, timeout=timeout, verbose=verbose, skip_permissions=skip_permissions)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def main():
     """Example usage"""
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python capture_claude_simple.py <prompt> [--skip-permissions]")
+        print("Usage: python capture_claude_simple.py <prompt> [--skip-permissions] [--cache]")
         print("  --skip-permissions: Automatically approve all tool use (use with caution)")
+        print("  --cache: Reuse the answer from an identical run in the last day (not with --skip-permissions)")
         sys.exit(1)
     
     prompt = sys.argv[1]
     skip_permissions = '--skip-permissions' in sys.argv
+    use_cache = '--cache' in sys.argv
     
     if skip_permissions:
         print("Warning: Running with --skip-permissions flag")
     
     print("Capturing Claude's response...")
-    output, code = capture_claude_print(prompt, verbose=True, skip_permissions=skip_permissions)
+    output, code = capture_claude_print(prompt, verbose=True, skip_permissions=skip_permissions,
+                                        use_cache=use_cache)
     
     if code == 0:
         print("\n--- Claude's Response ---")
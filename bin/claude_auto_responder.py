@@ -8,29 +8,78 @@ import subprocess
 import sys
 import os
 import time
-import select
-import threading
-import queue
-from pathlib import Path
+import signal
+import fcntl
+import selectors
+import shutil
 import click
 import re
 from datetime import datetime
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Permission prompts to answer; bounded instead of '.*' so a long line without '?'
+# can't trigger heavy backtracking
+PROMPT_PATTERNS = [
+    rb'Do you want to[^?\n]{0,200}\?',
+]
+# One alternation, so each scan is a single pass however many patterns there are
+_PERMISSION_RE = re.compile(b'|'.join(b'(?:%s)' % p for p in PROMPT_PATTERNS), re.IGNORECASE)
+_YES = b'1\n'
+# Rescan this many bytes before the watermark so a prompt split across reads is still found
+_SCAN_OVERLAP = 256
+
+# Resolve claude once at import instead of hardcoding a per-user path
+_CLAUDE_PATH = shutil.which('claude') or os.path.expanduser('~/.npm-global/bin/claude')
+
+
+def _split_lines(buffer, chunk):
+    """
+    Append a chunk read from a pipe to its buffer and return the decoded complete lines.
+    
+    An empty chunk means EOF, in which case any trailing partial line is flushed too.
+    """
+    if not chunk:
+        lines = [bytes(buffer)] if buffer else []
+        buffer.clear()
+    else:
+        buffer += chunk
+        lines = buffer.splitlines(keepends=True)
+        # Keep a trailing partial line in the buffer until its newline arrives
+        if lines and not lines[-1].endswith((b'\n', b'\r')):
+            buffer[:] = lines.pop()
+        else:
+            buffer.clear()
+    return [line.decode('utf-8', 'replace') for line in lines]
+
+
+def _dumps(obj):
+    """Serialize log data to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+
 
 class ClaudeAutoResponder:
     """Handles automated responses to Claude's permission prompts."""
     
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, log_file=None):
         self.verbose = verbose
-        self.permission_pattern = re.compile(r'Do you want to.*\?', re.IGNORECASE)
-        self.output_queue = queue.Queue()
         self.process = None
         self.logs = []
+        # When a log file is given, entries are streamed to it as JSON Lines
+        # instead of being kept in memory
+        self.log_file = log_file
+        self._log_handle = open(log_file, 'wb') if log_file else None
         
     def log(self, message, feature="subprocess", module="auto_responder", **kwargs):
         """Enhanced logging with tags and parameters."""
-        timestamp = datetime.now().isoformat()
+        timestamp = time.time_ns()
         log_entry = {
             "timestamp": timestamp,
             "feature": feature,
@@ -38,203 +87,247 @@ class ClaudeAutoResponder:
             "message": message,
             "parameters": kwargs
         }
-        self.logs.append(log_entry)
+        if self._log_handle is not None:
+            self._log_handle.write(_dumps(log_entry) + b'\n')
+        else:
+            self.logs.append(log_entry)
         
         if self.verbose:
+            when = datetime.fromtimestamp(timestamp / 1e9).isoformat()
             params_str = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
             if params_str:
-                print(f"[{timestamp}] [{feature}:{module}] {message} ({params_str})", file=sys.stderr)
+                print(f"[{when}] [{feature}:{module}] {message} ({params_str})", file=sys.stderr)
             else:
-                print(f"[{timestamp}] [{feature}:{module}] {message}", file=sys.stderr)
+                print(f"[{when}] [{feature}:{module}] {message}", file=sys.stderr)
     
-    def detect_permission_prompt(self, text):
-        """Check if the text contains a permission prompt."""
-        return bool(self.permission_pattern.search(text))
+    def detect_permission_prompt(self, buf):
+        """Check if the raw output bytes contain a permission prompt."""
+        return _PERMISSION_RE.search(buf) is not None
     
-    def read_output(self, pipe, name):
-        """Read output from a pipe in a separate thread."""
+    def terminate(self, grace=2):
+        """Terminate Claude together with anything it spawned (e.g. MCP servers)."""
+        # Claude runs in its own session, so its pid is also the process group id
         try:
-            for line in iter(pipe.readline, ''):
-                if line:
-                    self.output_queue.put((name, line))
-                    if name == 'stderr' and self.verbose:
-                        self.log("Received stderr output", feature="output", module="reader", content=line.strip())
-        except Exception as e:
-            if self.verbose:
-                self.log("Error reading pipe", feature="error", module="reader", pipe_name=name, error=str(e))
-        finally:
-            pipe.close()
+            os.killpg(self.process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            self.process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            self.log("Process group ignored SIGTERM, killing", feature="lifecycle", module="monitor",
+                    grace=grace)
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    
+    def close_logs(self):
+        """Close the streaming log file, if one is open."""
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
     
     def save_logs(self, filepath):
         """Save logs to a JSON file for analysis."""
-        with open(filepath, 'w') as f:
-            json.dump(self.logs, f, indent=2)
+        if self._log_handle is not None:
+            # Entries were already streamed to the log file
+            self.close_logs()
+            return
+        # Compact, single-pass serialization - pretty-printing long sessions is slow
+        with open(filepath, 'wb') as f:
+            f.write(_dumps(self.logs) + b'\n')
         self.log("Logs saved", feature="logging", module="saver", filepath=filepath, count=len(self.logs))
     
-    def run_claude_interactive(self, path, initial_input, wait_time=5, timeout=300):
+    def run_claude_interactive(self, path, initial_input, wait_time=2, timeout=300):
         """
         Run Claude interactively and respond to permission prompts.
         
         Args:
             path: Directory to run Claude in
             initial_input: Initial input to send to Claude
-            wait_time: Time to wait before sending initial input
+            wait_time: Maximum time to wait for Claude's first output before sending initial input
             timeout: Maximum time to wait for Claude response (default 300s)
             
         Returns:
             tuple: (full_output, return_code)
         """
-        # Validate path
-        path_obj = Path(path)
-        if not path_obj.exists():
+        # Validate path once and hand the resolved directory straight to the subprocess
+        cwd = os.path.abspath(path)
+        if not os.path.isdir(cwd):
             raise ValueError(f"Path '{path}' does not exist")
         
-        # Full path to claude
-        claude_path = "/home/laurelin/.npm-global/bin/claude"
-        
-        self.log("Starting Claude subprocess", feature="startup", module="main", path=str(path), input=initial_input)
+        self.log("Starting Claude subprocess", feature="startup", module="main", path=cwd, input=initial_input)
         
         # Start Claude process
-        self.log("Creating subprocess", feature="startup", module="main", command=claude_path)
+        self.log("Creating subprocess", feature="startup", module="main", command=_CLAUDE_PATH)
         try:
             self.process = subprocess.Popen(
-                [claude_path],
+                [_CLAUDE_PATH],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                cwd=path,
-                bufsize=1,
-                universal_newlines=True
+                cwd=cwd,
+                bufsize=0,
+                start_new_session=True
             )
             self.log("Subprocess created", feature="startup", module="main", pid=self.process.pid)
         except Exception as e:
             self.log("Failed to create subprocess", feature="error", module="main", error=str(e))
             raise
         
-        # Start threads to read output
-        stdout_thread = threading.Thread(
-            target=self.read_output, 
-            args=(self.process.stdout, 'stdout')
-        )
-        stderr_thread = threading.Thread(
-            target=self.read_output,
-            args=(self.process.stderr, 'stderr')
-        )
-        
-        stdout_thread.daemon = True
-        stderr_thread.daemon = True
-        stdout_thread.start()
-        stderr_thread.start()
+        # Watch both pipes with a selector instead of a reader thread per pipe
+        sel = selectors.DefaultSelector()
+        for pipe, name in ((self.process.stdout, 'stdout'), (self.process.stderr, 'stderr')):
+            fd = pipe.fileno()
+            fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+            sel.register(fd, selectors.EVENT_READ, name)
         
         # Show starting indicator
         print(f"Starting Claude instance...", file=sys.stderr)
         
-        # Collect all output
-        full_output = []
-        permission_detected = False
+        # All output lands in one buffer, which is also what the prompt scan reads;
+        # stderr additionally keeps a line buffer for the [STDERR] echo
+        full_buf = bytearray()
+        stderr_lines = bytearray()
+        last_scanned = 0
+        prompt_end = 0
+        prompt_seen_ts = None
         initial_sent = False
-        start_time = time.time()
-        last_wait_message = 0
+        start_time = time.monotonic()
         
-        last_activity = time.time()
+        last_activity = start_time
+        last_output_ts = start_time
         output_count = 0
-        initial_output_received = False
+        first_output_ts = None
         
         try:
             while True:
+                # One clock read per iteration; monotonic so clock steps can't fake a timeout
+                now = time.monotonic()
+                
                 # Check if process has terminated
                 poll_result = self.process.poll()
                 if poll_result is not None:
                     self.log("Process terminated", feature="lifecycle", module="monitor", 
-                            return_code=poll_result, duration=time.time()-start_time)
+                            return_code=poll_result, duration=now - start_time)
                     break
                 
                 # Check for timeout
-                elapsed_time = time.time() - start_time
+                elapsed_time = now - start_time
                 if elapsed_time > timeout:
                     self.log("Process timeout", feature="timeout", module="monitor",
                             duration=elapsed_time, timeout=timeout)
                     print(f"\n[ERROR] Claude process timed out after {timeout} seconds", file=sys.stderr)
-                    self.process.terminate()
+                    self.terminate()
                     break
                 
                 # Log process status periodically
-                if time.time() - last_activity > 10:
+                if now - last_activity > 10:
                     self.log("Process still running", feature="heartbeat", module="monitor",
                             duration=elapsed_time, output_count=output_count)
-                    last_activity = time.time()
+                    last_activity = now
                 
-                # Wait for initial output or timeout before sending input
+                # Send input as soon as Claude starts producing output, or after
+                # wait_time if it stays silent
                 if not initial_sent:
-                    elapsed = time.time() - start_time
+                    ready = first_output_ts is not None and now - first_output_ts >= 0.05
                     
-                    # Send input either after wait_time OR when we receive initial output
-                    should_send = (elapsed >= wait_time) or (initial_output_received and elapsed >= 1)
-                    
-                    if should_send:
+                    if ready or elapsed_time >= wait_time:
                         print(f"\nSending request to Claude: {initial_input[:50]}{'...' if len(initial_input) > 50 else ''}", file=sys.stderr)
                         self.log("Sending initial input", feature="input", module="main", 
-                                input_length=len(initial_input), waited=elapsed, 
-                                initial_output=initial_output_received)
-                        self.process.stdin.write(initial_input + '\n')
-                        self.process.stdin.flush()
+                                input_length=len(initial_input), waited=elapsed_time, 
+                                initial_output=first_output_ts is not None)
+                        os.write(self.process.stdin.fileno(), initial_input.encode('utf-8') + b'\n')
                         initial_sent = True
                         print("Claude is processing your request...\n", file=sys.stderr)
-                    else:
-                        # Show waiting message
-                        if elapsed - last_wait_message >= 1:  # Update every second
-                            remaining = wait_time - elapsed
-                            if remaining > 0:
-                                status = " (waiting for prompt)" if not initial_output_received else ""
-                                print(f"\rWaiting {remaining:.0f}s before sending input{status}...", end='', file=sys.stderr)
-                                last_wait_message = elapsed
+                
+                # Answer a detected permission prompt once output has been quiet for
+                # 30 ms (the prompt is fully drawn), or after 200 ms at the latest
+                if prompt_seen_ts is not None:
+                    if now - last_output_ts >= 0.03 or now - prompt_seen_ts >= 0.2:
+                        self.log("Auto-responding with '1'", feature="permission", module="responder",
+                                waited=now - prompt_seen_ts)
+                        os.write(self.process.stdin.fileno(), _YES)
+                        prompt_seen_ts = None
+                
+                # Sleep until output arrives or the next deadline (reply / initial send / timeout)
+                if prompt_seen_ts is not None:
+                    remaining = 0.03
+                elif not initial_sent:
+                    remaining = 0.05
+                else:
+                    remaining = max(0, min(1.0, timeout - elapsed_time))
+                if not sel.get_map():
+                    # Both pipes are closed; just wait for the process to exit
+                    try:
+                        self.process.wait(timeout=remaining)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    continue
                 
                 # Process any output
-                try:
-                    source, line = self.output_queue.get(timeout=0.1)
-                    full_output.append(line)
-                    output_count += 1
-                    last_activity = time.time()
+                events = sel.select(timeout=remaining)
+                if events:
+                    now = time.monotonic()
+                for key, _ in events:
+                    source = key.data
+                    try:
+                        chunk = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        if source == 'stderr':
+                            for line in _split_lines(stderr_lines, chunk):
+                                print(f"[STDERR] {line}", end='', file=sys.stderr, flush=True)
+                        continue
                     
-                    # Mark that we've received initial output
-                    if not initial_output_received:
-                        initial_output_received = True
-                        self.log("Initial output received", feature="output", module="processor",
-                                source=source, content_preview=line[:50])
-                    
-                    self.log("Received output", feature="output", module="processor", 
-                            source=source, line_length=len(line), total_lines=output_count)
-                    
-                    # Print output in real-time
-                    if source == 'stdout':
-                        print(line, end='', flush=True)
-                    elif source == 'stderr' and line.strip():
-                        # Show stderr as well (might contain important info)
-                        print(f"[STDERR] {line}", end='', file=sys.stderr, flush=True)
-                    
-                    # Check for permission prompt
-                    if self.detect_permission_prompt(line):
-                        self.log("Permission prompt detected", feature="permission", module="detector", prompt=line.strip())
-                        permission_detected = True
+                    try:
+                        full_buf += chunk
+                        output_count += 1
+                        last_activity = now
+                        last_output_ts = now
                         
-                        # Wait a moment for the full prompt to appear
-                        time.sleep(0.5)
+                        # Mark that we've received initial output
+                        if first_output_ts is None:
+                            first_output_ts = now
+                            if self.verbose:
+                                self.log("Initial output received", feature="output", module="processor",
+                                        source=source, content_preview=chunk[:50].decode('utf-8', 'replace'))
                         
-                        # Send "1" as response
-                        self.log("Auto-responding with '1'", feature="permission", module="responder")
-                        self.process.stdin.write('1\n')
-                        self.process.stdin.flush()
-                        permission_detected = False
+                        # Per-chunk trace is only worth its cost when someone is watching
+                        if self.verbose:
+                            self.log("Received output", feature="output", module="processor", 
+                                    source=source, chunk_length=len(chunk), total_chunks=output_count)
                         
-                except queue.Empty:
-                    continue
-                except Exception as e:
-                    self.log("Error processing output", feature="error", module="main", error=str(e))
+                        # Print output in real-time
+                        if source == 'stdout':
+                            sys.stdout.buffer.write(chunk)
+                            sys.stdout.buffer.flush()
+                        else:
+                            # Show stderr as well (might contain important info)
+                            for line in _split_lines(stderr_lines, chunk):
+                                if line.strip():
+                                    print(f"[STDERR] {line}", end='', file=sys.stderr, flush=True)
+                            
+                    except Exception as e:
+                        self.log("Error processing output", feature="error", module="main", error=str(e))
+                    
+                    # Check for permission prompt in the bytes that arrived since the last scan,
+                    # never re-matching a prompt that was already answered
+                    match = _PERMISSION_RE.search(full_buf, max(last_scanned - _SCAN_OVERLAP, prompt_end))
+                    last_scanned = len(full_buf)
+                    if match:
+                        prompt_end = match.end()
+                        self.log("Permission prompt detected", feature="permission", module="detector",
+                                prompt=match.group().decode('utf-8', 'replace'))
+                        # The "1" reply is sent from the top of the loop once output settles
+                        if prompt_seen_ts is None:
+                            prompt_seen_ts = now
         
         except KeyboardInterrupt:
             self.log("Process interrupted by user", feature="interrupt", module="main")
-            self.process.terminate()
+            self.terminate()
             raise
         
         finally:
@@ -242,26 +335,37 @@ class ClaudeAutoResponder:
             return_code = self.process.wait()
             
             # Drain any remaining output
-            while not self.output_queue.empty():
-                try:
-                    source, line = self.output_queue.get_nowait()
-                    full_output.append(line)
-                    if source == 'stdout':
-                        print(line, end='', flush=True)
-                except:
+            while sel.get_map():
+                events = sel.select(timeout=0.1)
+                if not events:
+                    # Pipe held open by a grandchild - nothing more to read
                     break
+                for key, _ in events:
+                    source = key.data
+                    try:
+                        chunk = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        continue
+                    full_buf += chunk
+                    if source == 'stdout':
+                        sys.stdout.buffer.write(chunk)
+                        sys.stdout.buffer.flush()
+            sel.close()
         
-        return ''.join(full_output), return_code
+        return full_buf.decode('utf-8', 'replace'), return_code
 
 
 @click.command()
 @click.argument('path', type=click.Path(exists=True, file_okay=False, dir_okay=True))
 @click.argument('input_string')
-@click.option('--wait-time', default=5, help='Wait time before sending initial input (seconds)')
+@click.option('--wait-time', default=2, help='Maximum wait for first output before sending initial input (seconds)')
 @click.option('--timeout', default=300, help='Maximum time to wait for Claude response (seconds)')
 @click.option('--verbose', is_flag=True, help='Enable verbose output')
 @click.option('--save-to', type=click.Path(), help='Save output to file')
-@click.option('--save-logs', type=click.Path(), help='Save debug logs to JSON file')
+@click.option('--save-logs', type=click.Path(), help='Save debug logs to a JSON Lines file')
 def main(path, input_string, wait_time, timeout, verbose, save_to, save_logs):
     """
     Run Claude with automatic response to permission prompts.
@@ -273,8 +377,11 @@ def main(path, input_string, wait_time, timeout, verbose, save_to, save_logs):
         python claude_auto_responder.py . "Fix the bug" --verbose
     """
     try:
-        # Create auto-responder instance
-        responder = ClaudeAutoResponder(verbose=verbose)
+        # Create auto-responder instance; logs stream straight to --save-logs
+        responder = ClaudeAutoResponder(verbose=verbose, log_file=save_logs)
+        if not save_logs and not verbose:
+            # Nobody will read the logs - skip building entries entirely
+            responder.log = lambda *args, **kwargs: None
         
         # Run Claude with auto-response
         output, return_code = responder.run_claude_interactive(
@@ -292,7 +399,7 @@ def main(path, input_string, wait_time, timeout, verbose, save_to, save_logs):
         
         # Save logs if requested
         if save_logs:
-            responder.save_logs(save_logs)
+            responder.close_logs()
             print(f"Debug logs saved to: {save_logs}")
         
         return output
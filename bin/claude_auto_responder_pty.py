@@ -22,6 +22,10 @@ import threading
 import queue
 
 
+# '\r' progress updates only make sense on a terminal; skip them when stderr is piped
+_STDERR_IS_TTY = sys.stderr.isatty()
+
+
 class ClaudePTYAutoResponder:
     """Handles automated responses to Claude's permission prompts using PTY."""
     
@@ -175,7 +179,7 @@ class ClaudePTYAutoResponder:
                         os.write(master_fd, (initial_input + '\n').encode())
                         initial_sent = True
                         print("Claude is processing your request...\n", file=sys.stderr)
-                    else:
+                    elif _STDERR_IS_TTY:
                         # Show waiting message
                         if elapsed - last_wait_message >= 1:
                             remaining = wait_time - elapsed
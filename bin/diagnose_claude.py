@@ -3,34 +3,59 @@
 Diagnose Claude CLI behavior
 """
 
+import argparse
 import subprocess
 import sys
 import time
 import os
 
+# All quick probes run in a single bash process; sections are separated by
+# a marker line so one fork+exec replaces a subprocess per check
+PROBE_SEPARATOR = '--- probe ---\n'
+PROBE_SCRIPT = """
+which claude
+echo '--- probe ---'
+errfile=$(mktemp)
+# The trailing x keeps command substitution from dropping trailing newlines
+out=$(claude --help 2>"$errfile"; rc=$?; echo x; exit $rc); rc=$?; out=${out%x}
+err=$(cat "$errfile"; echo x); err=${err%x}; rm -f "$errfile"
+echo "rc=$rc"; echo "stdout_len=${#out}"; echo "stderr_len=${#err}"; printf '%s' "${err:0:200}"
+echo '--- probe ---'
+bash -ic 'which claude' 2>/dev/null
+"""
+
+
 def test_claude_direct():
     """Test Claude with direct subprocess call"""
     print("Test 1: Direct subprocess call")
     print("-" * 50)
     
     try:
+        # In its own session, so the interactive bash can't take over our terminal
+        result = subprocess.run(['bash', '-c', PROBE_SCRIPT], capture_output=True, text=True, timeout=10,
+                                stdin=subprocess.DEVNULL,
+                                start_new_session=True)
+        which_out, help_out, login_which = (result.stdout.split(PROBE_SEPARATOR) + ['', ''])[:3]
+        
         # Test if claude command exists
-        result = subprocess.run(['which', 'claude'], capture_output=True, text=True)
-        print(f"Claude path: {result.stdout.strip()}")
+        claude_path = which_out.strip()
+        print(f"Claude path: {claude_path}")
         
         # Check if it's executable
-        claude_path = result.stdout.strip()
-        if os.path.exists(claude_path):
+        if claude_path and os.path.exists(claude_path):
             print(f"Executable: {os.access(claude_path, os.X_OK)}")
             
-        # Try running claude with --help
+        # Result of running claude with --help
         print("\nTesting 'claude --help':")
-        result = subprocess.run(['claude', '--help'], capture_output=True, text=True, timeout=5)
-        print(f"Return code: {result.returncode}")
-        print(f"Stdout length: {len(result.stdout)}")
-        print(f"Stderr length: {len(result.stderr)}")
-        if result.stderr:
-            print(f"Stderr: {result.stderr[:200]}")
+        return_code, stdout_len, stderr_len, stderr_head = (help_out.split('\n', 3) + ['', '', '', ''])[:4]
+        print(f"Return code: {return_code.partition('=')[2]}")
+        print(f"Stdout length: {stdout_len.partition('=')[2]}")
+        print(f"Stderr length: {stderr_len.partition('=')[2]}")
+        if stderr_head:
+            print(f"Stderr: {stderr_head}")
+        
+        # Interactive shells may have a different PATH (e.g. from .bashrc)
+        print(f"\nClaude path in interactive bash: {login_which.strip() or 'not found'}")
             
     except subprocess.TimeoutExpired:
         print("ERROR: Command timed out")
@@ -99,7 +124,16 @@ def test_claude_env():
         else:
             print(f"{var}: {value}")
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Diagnose Claude CLI behavior")
+    parser.add_argument('--mode', choices=['basic', 'full'], default='full',
+                        help="basic: PATH/executable probes only; full: also start an interactive session")
+    args = parser.parse_args()
+    
     test_claude_direct()
-    test_claude_interactive()
-    test_claude_env()
\ No newline at end of file
+    if args.mode == 'full':
+        test_claude_interactive()
+    test_claude_env()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -8,28 +8,120 @@ import os
 import time
 import subprocess
 import platform
+import functools
+import shutil
 import click
-import pyautogui
-from pathlib import Path
 
 
+@functools.lru_cache(maxsize=256)
 def convert_wsl_path(linux_path):
     """Convert WSL Linux path to Windows path format."""
     try:
-        result = subprocess.run(['wslpath', '-w', linux_path], 
-                              capture_output=True, text=True, check=True)
+        # Only stdout is needed, and the short-lived child inherits nothing worth closing
+        result = subprocess.run(['wslpath', '-w', linux_path], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True, close_fds=False)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         # If conversion fails, return original path
         return linux_path
 
 
+@functools.lru_cache(maxsize=1)
+def _pyautogui():
+    """Import and configure pyautogui on first use; only --windowed needs it."""
+    import pyautogui
+    # Disable pyautogui failsafe for better automation
+    pyautogui.FAILSAFE = False
+    # Text is pasted in one go, so there's nothing to pace between keystrokes
+    pyautogui.PAUSE = 0
+    return pyautogui
+
+
+def spawn_detached(cmd):
+    """Start cmd without waiting for it; posix_spawn skips forking our Python heap."""
+    if hasattr(os, "posix_spawnp"):
+        return os.posix_spawnp(cmd[0], cmd, os.environ)
+    return subprocess.Popen(cmd).pid
+
+
+# Terminals that hand the new window to an already running server process, so it
+# never belongs to the pid we spawned; their windows are found by class instead
+WINDOW_CLASSES = {
+    "gnome-terminal": "gnome-terminal",
+    "terminator": "terminator",
+    "xfce4-terminal": "xfce4-terminal",
+}
+
+
+def find_windows(*criteria):
+    """Ids of the visible X11 windows xdotool finds for criteria, or None without X11/xdotool."""
+    if not (os.environ.get("DISPLAY") and shutil.which("xdotool")):
+        return None
+    found = subprocess.run(["xdotool", "search", "--onlyvisible", *criteria],
+                           stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, close_fds=False)
+    return set(found.stdout.split())
+
+
+def wait_for_window(pid, timeout, window_class=None, existing=frozenset()):
+    """
+    Wait until the new terminal's window is visible, or timeout seconds pass.
+    
+    The window is looked up by pid, or with window_class as a window of that
+    class whose id isn't in existing (the ones open before the terminal started).
+    """
+    deadline = time.monotonic() + timeout
+    criteria = ["--class", window_class] if window_class else ["--pid", str(pid)]
+    windows = find_windows(*criteria)
+    if windows is not None:
+        while not windows - existing:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+            windows = find_windows(*criteria)
+        return True
+    
+    # No way to watch for the window (WSL, macOS, Wayland), so wait out the full delay
+    time.sleep(max(0, deadline - time.monotonic()))
+    return False
+
+
+def paste_text(text):
+    """Insert text into the focused terminal with one clipboard paste instead of per-key events."""
+    if _PLATFORM[1]:
+        # WSL: write straight to the Windows clipboard, bypassing X11
+        subprocess.run(["clip.exe"], input=("\ufeff" + text).encode("utf-16-le"), check=True)
+    else:
+        import pyperclip
+        pyperclip.copy(text)
+    
+    if _PLATFORM[0] == "darwin":
+        _pyautogui().hotkey("command", "v")
+    else:
+        # Terminals paste on Ctrl+Shift+V (plain Ctrl+V is a control character there)
+        _pyautogui().hotkey("ctrl", "shift", "v")
+
+
+def _detect_platform():
+    """Return (system, is_wsl) for the current machine."""
+    system = platform.system().lower()
+    is_wsl = system == "linux" and os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop")
+    return system, is_wsl
+
+
+# The platform can't change while we run, so detect it once
+_PLATFORM = _detect_platform()
+
+# Full path to claude avoids PATH issues; resolved once, falling back to plain 'claude'
+_CLAUDE_CMD = next((p for p in ("/home/laurelin/.npm-global/bin/claude",) if os.path.exists(p)), "claude")
+
+
+@functools.lru_cache(maxsize=1)
 def get_terminal_command():
     """Get the appropriate terminal command based on the platform."""
-    system = platform.system().lower()
+    system, is_wsl = _PLATFORM
     
     # Check if running in WSL
-    if system == "linux" and os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop"):
+    if is_wsl:
         # Running in WSL, use Windows Terminal
         return ["wt.exe", "-d"]
     
@@ -43,13 +135,10 @@ def get_terminal_command():
             ["xfce4-terminal", "--working-directory"]
         ]
         
+        # A PATH lookup is enough to know the terminal is installed; no need to run it
         for terminal in terminals:
-            try:
-                subprocess.run([terminal[0], "--version"], 
-                             capture_output=True, check=True)
+            if shutil.which(terminal[0]):
                 return terminal
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
                 
         raise RuntimeError("No supported terminal emulator found")
     
@@ -64,28 +153,46 @@ def get_terminal_command():
 
 
 def open_terminal_at_path(path):
-    """Open a new terminal window at the specified path."""
+    """
+    Open a new terminal window at the specified path.
+    
+    Returns (pid, window_class, existing) as wait_for_window takes them.
+    """
     terminal_cmd = get_terminal_command()
+    system, is_wsl = _PLATFORM
     
     # Check if running in WSL
-    if platform.system().lower() == "linux" and os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop"):
+    if is_wsl:
         # Use Windows Terminal in WSL - convert path to Windows format
         windows_path = convert_wsl_path(path)
         cmd = [terminal_cmd[0], terminal_cmd[1], windows_path]
-    elif platform.system().lower() == "linux":
+    elif system == "linux":
         if len(terminal_cmd) == 2:  # gnome-terminal style
             cmd = [terminal_cmd[0], f"{terminal_cmd[1]}={path}"]
         else:  # xterm style
             cmd = [terminal_cmd[0], terminal_cmd[1], 
                    terminal_cmd[2].format(path), "bash"]
-    elif platform.system().lower() == "darwin":
+    elif system == "darwin":
         # macOS requires a different approach
         script = f'tell application "Terminal" to do script "cd {path}"'
         cmd = ["osascript", "-e", script]
     else:  # Windows
         cmd = ["cmd", "/c", "start", "cmd", "/k", f"cd /d {path}"]
     
-    subprocess.Popen(cmd)
+    # Note the windows this terminal already has, to tell the new one apart
+    window_class = WINDOW_CLASSES.get(cmd[0])
+    existing = (find_windows("--class", window_class) or set()) if window_class else set()
+    
+    # We keep running (to type into the terminal), so spawn rather than exec
+    return spawn_detached(cmd), window_class, existing
+
+
+def run_claude_piped(path, input_string):
+    """Run claude in path with input_string piped to its stdin; output goes to our terminal."""
+    proc = subprocess.Popen([_CLAUDE_CMD], cwd=path, stdin=subprocess.PIPE)
+    proc.stdin.write(input_string.encode("utf-8") + b"\n")
+    proc.stdin.close()
+    return proc.wait()
 
 
 @click.command()
@@ -94,41 +201,50 @@ def open_terminal_at_path(path):
 @click.argument('input_string')
 @click.option('--delay', default=2, help='Delay before typing (seconds)')
 @click.option('--verbose', is_flag=True, help='Enable verbose output')
-def main(path, input_string, delay, verbose):
+@click.option('--windowed', is_flag=True, help='Open a new terminal window and type into it with pyautogui')
+def main(path, input_string, delay, verbose, windowed):
     """
-    Open a terminal at PATH, run 'claude' command, wait 5 seconds,
-    then enter INPUT_STRING and press Enter.
+    Run 'claude' in PATH and send it INPUT_STRING.
+    
+    By default claude runs in the current terminal with INPUT_STRING piped
+    to its stdin. With --windowed, a terminal is opened at PATH, 'claude'
+    is typed into it, and INPUT_STRING is entered 5 seconds later.
     
     Example:
         python run_claude.py /home/user/project "Hello Claude"
+        python run_claude.py --windowed /home/user/project "Hello Claude"
     """
     
-    # Validate path
-    path_obj = Path(path)
-    if not path_obj.exists():
-        click.echo(f"Error: Path '{path}' does not exist", err=True)
-        sys.exit(1)
-    
-    if not path_obj.is_dir():
-        click.echo(f"Error: Path '{path}' is not a directory", err=True)
-        sys.exit(1)
+    # click.Path has already checked that path exists and is a directory,
+    # and resolve_path=True made it absolute, so it is used as given
+    if not windowed:
+        if verbose:
+            click.echo(f"Running claude in: {path}")
+        try:
+            return_code = run_claude_piped(path, input_string)
+        except OSError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        sys.exit(return_code)
     
     if verbose:
         click.echo(f"Opening terminal at: {path}")
         click.echo(f"Will enter string: {input_string}")
     
     try:
+        pyautogui = _pyautogui()
+        
         # Open terminal at specified path
-        open_terminal_at_path(str(path_obj))
+        terminal_pid, window_class, existing = open_terminal_at_path(path)
         
         # Wait for terminal to open
         if verbose:
-            click.echo(f"Waiting {delay} seconds for terminal to open...")
-        time.sleep(delay)
+            click.echo(f"Waiting up to {delay} seconds for terminal to open...")
+        wait_for_window(terminal_pid, delay, window_class, existing)
         
         # Try to ensure the terminal window has focus
         # This is especially important in WSL/Windows environments
-        if platform.system().lower() == "linux" and os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop"):
+        if _PLATFORM[1]:
             # For WSL, try to bring window to front
             pyautogui.hotkey('alt', 'tab')
             time.sleep(0.5)
@@ -136,13 +252,7 @@ def main(path, input_string, delay, verbose):
         # Type the claude command with full path
         if verbose:
             click.echo("Typing 'claude' command...")
-        # Use full path to claude to avoid PATH issues
-        claude_path = "/home/laurelin/.npm-global/bin/claude"
-        if os.path.exists(claude_path):
-            pyautogui.typewrite(claude_path)
-        else:
-            # Fallback to just 'claude' if full path doesn't exist
-            pyautogui.typewrite("claude")
+        paste_text(_CLAUDE_CMD)
         pyautogui.press("enter")
         
         # Wait 5 seconds as requested
@@ -153,7 +263,7 @@ def main(path, input_string, delay, verbose):
         # Type the input string
         if verbose:
             click.echo(f"Typing input string: {input_string}")
-        pyautogui.typewrite(input_string)
+        paste_text(input_string)
         
         # Press Enter
         pyautogui.press("enter")
@@ -167,6 +277,4 @@ def main(path, input_string, delay, verbose):
 
 
 if __name__ == "__main__":
-    # Disable pyautogui failsafe for better automation
-    pyautogui.FAILSAFE = False
     main()
\ No newline at end of file
@@ -8,43 +8,114 @@ import sys
 import os
 import time
 import json
+import stat
 import logging
 import subprocess
 import platform
+import functools
+import shutil
+from collections import ChainMap
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import AbstractSet, Optional, Dict, List, Set, Tuple
 
 import click
-import pyautogui
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+# Full path to claude avoids PATH issues; resolved once, falling back to plain 'claude'
+_CLAUDE_CMD = next((p for p in ("/home/laurelin/.npm-global/bin/claude",) if os.path.exists(p)), "claude")
+
+
+@functools.lru_cache(maxsize=256)
 def convert_wsl_path(linux_path: str) -> str:
     """Convert WSL Linux path to Windows path format."""
     try:
-        result = subprocess.run(['wslpath', '-w', linux_path], 
-                              capture_output=True, text=True, check=True)
+        # Only stdout is needed, and the short-lived child inherits nothing worth closing
+        result = subprocess.run(['wslpath', '-w', linux_path], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True, close_fds=False)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         # If conversion fails, return original path
         return linux_path
 
 
+def spawn_detached(command: List[str]) -> int:
+    """Start a command without waiting for it; posix_spawn skips forking our Python heap."""
+    if hasattr(os, "posix_spawnp"):
+        return os.posix_spawnp(command[0], command, os.environ)
+    return subprocess.Popen(command).pid
+
+
+# Terminals that hand the new window to an already running server process, so it
+# never belongs to the pid we spawned; their windows are found by class instead
+WINDOW_CLASSES = {
+    "gnome-terminal": "gnome-terminal",
+    "terminator": "terminator",
+    "xfce4-terminal": "xfce4-terminal",
+}
+
+
+def find_windows(*criteria: str) -> Optional[Set[str]]:
+    """Ids of the visible X11 windows xdotool finds for criteria, or None without X11/xdotool."""
+    if not (os.environ.get("DISPLAY") and shutil.which("xdotool")):
+        return None
+    found = subprocess.run(["xdotool", "search", "--onlyvisible", *criteria],
+                           stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, close_fds=False)
+    return set(found.stdout.split())
+
+
+def wait_for_window(pid: int, timeout: float, window_class: Optional[str] = None,
+                    existing: AbstractSet[str] = frozenset()) -> bool:
+    """
+    Wait until the new terminal's window is visible, or timeout seconds pass.
+    
+    The window is looked up by pid, or with window_class as a window of that
+    class whose id isn't in existing (the ones open before the terminal started).
+    """
+    deadline = time.monotonic() + timeout
+    criteria = ["--class", window_class] if window_class else ["--pid", str(pid)]
+    windows = find_windows(*criteria)
+    if windows is not None:
+        while not windows - existing:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+            windows = find_windows(*criteria)
+        return True
+    
+    # No way to watch for the window (WSL, macOS, Wayland), so wait out the full delay
+    time.sleep(max(0, deadline - time.monotonic()))
+    return False
+
+
+# Shared by every handler setup_logging installs
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
 # Configure logging
 def setup_logging(verbose: bool, log_file: Optional[str] = None):
-    """Set up logging configuration."""
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    log_level = logging.DEBUG if verbose else logging.INFO
+    """Set up logging configuration; safe to call more than once."""
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
     
-    handlers = [logging.StreamHandler(sys.stdout)]
-    if log_file:
-        handlers.append(logging.FileHandler(log_file))
+    # Only add handlers that aren't there yet, so repeated calls don't duplicate output
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_FORMATTER)
+        root.addHandler(handler)
     
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=handlers
-    )
+    if log_file:
+        log_path = os.path.abspath(log_file)
+        if not any(getattr(h, "baseFilename", None) == log_path for h in root.handlers):
+            handler = logging.FileHandler(log_path)
+            handler.setFormatter(_FORMATTER)
+            root.addHandler(handler)
     
     return logging.getLogger(__name__)
 
@@ -52,30 +123,32 @@ def setup_logging(verbose: bool, log_file: Optional[str] = None):
 class Config:
     """Configuration management for the automation script."""
     
-    DEFAULT_CONFIG = {
+    # Read-only all the way down so instances can layer over it instead of copying it
+    DEFAULT_CONFIG = MappingProxyType({
         "terminal_spawn_delay": 2,
         "claude_wait_time": 5,
         "failsafe": False,
-        "terminal_preferences": {
-            "wsl": ["wt.exe"],
-            "linux": ["gnome-terminal", "konsole", "xterm", "terminator"],
-            "darwin": ["Terminal"],
-            "windows": ["cmd", "powershell"]
-        },
-        "keyboard_delay": 0.1
-    }
+        "terminal_preferences": MappingProxyType({
+            "wsl": ("wt.exe",),
+            "linux": ("gnome-terminal", "konsole", "xterm", "terminator"),
+            "darwin": ("Terminal",),
+            "windows": ("cmd", "powershell")
+        }),
+        "keyboard_delay": 0
+    })
     
     def __init__(self, config_file: Optional[str] = None):
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Overrides (config file, command line) land in the first map
+        self.config = ChainMap({}, self.DEFAULT_CONFIG)
         if config_file and Path(config_file).exists():
             self.load_config(config_file)
     
     def load_config(self, config_file: str):
         """Load configuration from JSON file."""
         try:
-            with open(config_file, 'r') as f:
-                user_config = json.load(f)
-                self.config.update(user_config)
+            data = Path(config_file).read_bytes()
+            user_config = orjson.loads(data) if orjson is not None else json.loads(data)
+            self.config.maps[0].update(user_config)
         except Exception as e:
             logging.warning(f"Failed to load config file: {e}")
     
@@ -88,6 +161,7 @@ class TerminalDetector:
     """Detect and manage terminal emulators across platforms."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_platform() -> str:
         """Get normalized platform name."""
         system = platform.system().lower()
@@ -107,37 +181,29 @@ class TerminalDetector:
     @staticmethod
     def find_terminal(preferences: List[str]) -> Optional[Tuple[str, List[str]]]:
         """Find available terminal from preferences list."""
+        if not preferences:
+            return None
+        
+        # Each check is a cached PATH lookup, so stop at the first terminal found
         for terminal in preferences:
             if TerminalDetector._is_terminal_available(terminal):
                 return terminal, TerminalDetector._get_terminal_command(terminal)
         return None
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _is_terminal_available(terminal: str) -> bool:
         """Check if terminal is available on the system."""
-        try:
-            if platform.system().lower() == "windows":
-                return True  # Assume cmd/powershell are always available
-            
-            # Special handling for wt.exe in WSL
-            if terminal == "wt.exe":
-                # Check if wt.exe is accessible
-                result = subprocess.run(
-                    ["which", "wt.exe"],
-                    capture_output=True,
-                    text=True
-                )
-                return result.returncode == 0
-            
-            subprocess.run(
-                [terminal, "--version"],
-                capture_output=True,
-                check=True,
-                timeout=2
-            )
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        if TerminalDetector.get_platform() == "windows":
+            return True  # Assume cmd/powershell are always available
+        
+        # Special handling for wt.exe in WSL
+        if terminal == "wt.exe":
+            # Check if wt.exe is accessible through the Windows PATH interop
+            return shutil.which("wt.exe") is not None
+        
+        # A PATH lookup is enough to know the terminal is installed; no need to run it
+        return shutil.which(terminal) is not None
     
     @staticmethod
     def _get_terminal_command(terminal: str) -> List[str]:
@@ -164,29 +230,65 @@ class ClaudeAutomation:
         self.config = config
         self.logger = logger
         self.platform = TerminalDetector.get_platform()
+        self._pyautogui = None
+    
+    @property
+    def gui(self):
+        """pyautogui, imported and configured on first use; only --windowed needs it."""
+        if self._pyautogui is None:
+            import pyautogui
+            
+            # Configure pyautogui
+            pyautogui.FAILSAFE = self.config.get("failsafe", False)
+            pyautogui.PAUSE = self.config.get("keyboard_delay", 0.1)
+            self._pyautogui = pyautogui
+        return self._pyautogui
+    
+    def paste_text(self, text: str):
+        """Insert text into the focused terminal with one clipboard paste instead of per-key events."""
+        if self.platform == "wsl":
+            # Write straight to the Windows clipboard, bypassing X11
+            subprocess.run(["clip.exe"], input=("\ufeff" + text).encode("utf-16-le"), check=True)
+        else:
+            import pyperclip
+            pyperclip.copy(text)
         
-        # Configure pyautogui
-        pyautogui.FAILSAFE = config.get("failsafe", False)
-        pyautogui.PAUSE = config.get("keyboard_delay", 0.1)
+        if self.platform == "darwin":
+            self.gui.hotkey("command", "v")
+        else:
+            # Terminals paste on Ctrl+Shift+V (plain Ctrl+V is a control character there)
+            self.gui.hotkey("ctrl", "shift", "v")
     
     def validate_path(self, path: str) -> Path:
         """Validate and resolve the given path."""
         path_obj = Path(path).resolve()
         
-        if not path_obj.exists():
+        # One stat() answers existence, type and (usually) permissions
+        try:
+            st = path_obj.stat()
+        except OSError:
             raise ValueError(f"Path does not exist: {path}")
         
-        if not path_obj.is_dir():
+        if not stat.S_ISDIR(st.st_mode):
             raise ValueError(f"Path is not a directory: {path}")
         
-        # Check if path is accessible
-        if not os.access(path_obj, os.R_OK | os.X_OK):
+        # Check if path is accessible; the owner bits settle our own directories,
+        # os.access covers everything else (group/other permissions, Windows)
+        owner_rx = stat.S_IRUSR | stat.S_IXUSR
+        is_owner = hasattr(os, "getuid") and st.st_uid == os.getuid()
+        if not (is_owner and (st.st_mode & owner_rx) == owner_rx) and \
+                not os.access(path_obj, os.R_OK | os.X_OK):
             raise PermissionError(f"No read/execute permission for: {path}")
         
         return path_obj
     
-    def open_terminal(self, path: Path) -> bool:
-        """Open terminal at the specified path."""
+    def open_terminal(self, path: Path) -> Tuple[int, Optional[str], Set[str]]:
+        """
+        Open terminal at the specified path.
+        
+        Returns the pid of the launched process, plus the window class and
+        already open window ids that wait_for_window needs to find its window.
+        """
         self.logger.info(f"Opening terminal at: {path}")
         
         # Get terminal preferences for platform
@@ -215,26 +317,59 @@ class ClaudeAutomation:
             else:
                 command.append(part)
         
+        # Note the windows this terminal already has, to tell the new one apart
+        window_class = WINDOW_CLASSES.get(terminal_name)
+        existing = (find_windows("--class", window_class) or set()) if window_class else set()
+        
         try:
             # Special handling for macOS
             if self.platform == "darwin":
                 apple_script = f'tell application "Terminal" to do script "cd {path}"'
-                subprocess.Popen(["osascript", "-e", apple_script])
+                pid = spawn_detached(["osascript", "-e", apple_script])
             else:
-                subprocess.Popen(command)
+                pid = spawn_detached(command)
             
             self.logger.info("Terminal opened successfully")
-            return True
+            return pid, window_class, existing
             
         except Exception as e:
             self.logger.error(f"Failed to open terminal: {e}")
             raise
     
-    def execute_automation(self, path: str, input_string: str, dry_run: bool = False):
-        """Execute the main automation sequence."""
+    def run_piped(self, path: Path, input_string: str, stdout=None, stderr=None) -> int:
+        """
+        Run claude at path with input_string written to its stdin; returns its exit code.
+        
+        claude writes to stdout/stderr (files) if given, otherwise to ours.
+        """
+        self.logger.info(f"Running {_CLAUDE_CMD} in: {path}")
+        proc = subprocess.Popen([_CLAUDE_CMD], cwd=str(path), stdin=subprocess.PIPE,
+                                stdout=stdout, stderr=stderr)
+        proc.stdin.write(input_string.encode("utf-8") + b"\n")
+        proc.stdin.close()
+        return_code = proc.wait()
+        self.logger.debug(f"claude exited with code {return_code}")
+        return return_code
+    
+    def execute_automation(self, path: str, input_string: str, dry_run: bool = False,
+                           windowed: bool = False, stdout=None, stderr=None) -> int:
+        """
+        Execute the main automation sequence.
+        
+        stdout and stderr are passed on to run_piped for piped runs.
+        """
         # Validate path
         validated_path = self.validate_path(path)
         
+        if dry_run and not windowed:
+            self.logger.info("DRY RUN MODE - No actions will be performed")
+            self.logger.info(f"Would run claude in: {validated_path}")
+            self.logger.info(f"Would pipe to stdin: {input_string}")
+            return 0
+        
+        if not windowed:
+            return self.run_piped(validated_path, input_string, stdout, stderr)
+        
         if dry_run:
             self.logger.info("DRY RUN MODE - No actions will be performed")
             self.logger.info(f"Would open terminal at: {validated_path}")
@@ -242,26 +377,24 @@ class ClaudeAutomation:
             self.logger.info(f"Would wait: {self.config.get('claude_wait_time')} seconds")
             self.logger.info(f"Would type: {input_string}")
             self.logger.info("Would press: Enter")
-            return
+            return 0
+        
+        # Load pyautogui now so a missing install fails before a terminal is opened
+        self.gui
         
         # Open terminal
-        self.open_terminal(validated_path)
+        terminal_pid, window_class, existing = self.open_terminal(validated_path)
         
         # Wait for terminal to spawn
         spawn_delay = self.config.get("terminal_spawn_delay", 2)
-        self.logger.info(f"Waiting {spawn_delay}s for terminal to spawn...")
-        time.sleep(spawn_delay)
+        self.logger.info(f"Waiting up to {spawn_delay}s for terminal to spawn...")
+        if wait_for_window(terminal_pid, spawn_delay, window_class, existing):
+            self.logger.debug("Terminal window is up")
         
         # Type claude command with full path
         self.logger.info("Typing 'claude' command...")
-        # Use full path to claude to avoid PATH issues
-        claude_path = "/home/laurelin/.npm-global/bin/claude"
-        if os.path.exists(claude_path):
-            pyautogui.typewrite(claude_path)
-        else:
-            # Fallback to just 'claude' if full path doesn't exist
-            pyautogui.typewrite("claude")
-        pyautogui.press("enter")
+        self.paste_text(_CLAUDE_CMD)
+        self.gui.press("enter")
         
         # Wait as specified
         wait_time = self.config.get("claude_wait_time", 5)
@@ -270,13 +403,14 @@ class ClaudeAutomation:
         
         # Type input string
         self.logger.info(f"Typing input: {input_string}")
-        pyautogui.typewrite(input_string)
+        self.paste_text(input_string)
         
         # Press Enter
         self.logger.info("Pressing Enter...")
-        pyautogui.press("enter")
+        self.gui.press("enter")
         
         self.logger.info("Automation completed successfully!")
+        return 0
 
 
 @click.command()
@@ -288,12 +422,14 @@ class ClaudeAutomation:
 @click.option('--log-file', type=click.Path(), help='Path to log file')
 @click.option('--spawn-delay', type=float, help='Override terminal spawn delay (seconds)')
 @click.option('--wait-time', type=float, help='Override Claude wait time (seconds)')
-def main(path, input_string, verbose, dry_run, config, log_file, spawn_delay, wait_time):
+@click.option('--windowed', is_flag=True, help='Open a new terminal window and type into it with pyautogui')
+def main(path, input_string, verbose, dry_run, config, log_file, spawn_delay, wait_time, windowed):
     """
     Advanced Claude terminal automation with comprehensive error handling.
     
-    Opens a terminal at PATH, runs 'claude' command, waits 5 seconds,
-    then enters INPUT_STRING and presses Enter.
+    Runs 'claude' in PATH with INPUT_STRING piped to its stdin. With
+    --windowed, opens a terminal at PATH instead, runs 'claude' command,
+    waits 5 seconds, then enters INPUT_STRING and presses Enter.
     
     Examples:
     
@@ -303,6 +439,9 @@ def main(path, input_string, verbose, dry_run, config, log_file, spawn_delay, wa
         # With verbose output
         python run_claude_advanced.py -v /home/user/project "Hello Claude"
         
+        # Old behaviour: drive a new terminal window
+        python run_claude_advanced.py --windowed /home/user/project "Hello Claude"
+        
         # Dry run to see what would happen
         python run_claude_advanced.py --dry-run /home/user/project "Test"
         
@@ -327,7 +466,7 @@ def main(path, input_string, verbose, dry_run, config, log_file, spawn_delay, wa
     
     try:
         # Execute automation
-        automation.execute_automation(path, input_string, dry_run)
+        return_code = automation.execute_automation(path, input_string, dry_run, windowed)
         
     except KeyboardInterrupt:
         logger.info("Operation cancelled by user")
@@ -338,6 +477,8 @@ def main(path, input_string, verbose, dry_run, config, log_file, spawn_delay, wa
         if verbose:
             logger.exception("Full error trace:")
         sys.exit(1)
+    
+    sys.exit(return_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Thin client for run_claude_daemon.py.
+
+Sends one job over the daemon's Unix socket and exits with its result.
+Uses only the standard library so it starts in a few milliseconds.
+"""
+
+import sys
+import os
+import json
+import socket
+import argparse
+import tempfile
+
+
+def default_socket_path():
+    """Socket location shared with run_claude_daemon.py."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"cc_enhancer-{os.getuid()}")
+    return os.path.join(runtime_dir, "cc_enhancer.sock")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send a Claude job to a running run_claude_daemon.py')
+    parser.add_argument('path', help='Directory to run claude in')
+    parser.add_argument('input_string', help='Input to send to claude')
+    parser.add_argument('--socket', help='Unix socket the daemon listens on')
+    parser.add_argument('--piped', action='store_true',
+                        help="Pipe the input to claude's stdin instead of typing into a new terminal")
+    parser.add_argument('--dry-run', action='store_true', help='Show what would be done without doing it')
+    args = parser.parse_args()
+
+    # The daemon has its own working directory, so send an absolute path
+    job = {
+        "path": os.path.abspath(args.path),
+        "input_string": args.input_string,
+        "windowed": not args.piped,
+        "dry_run": args.dry_run,
+    }
+
+    socket_path = args.socket or default_socket_path()
+    try:
+        # Only talk to a daemon of our own; anyone can create a socket in a shared directory
+        if os.lstat(socket_path).st_uid != os.getuid():
+            print(f"Error: {socket_path} belongs to another user", file=sys.stderr)
+            sys.exit(1)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(job).encode("utf-8") + b"\n")
+            reply = json.loads(sock.makefile("rb").readline())
+    except (OSError, ValueError) as e:
+        print(f"Error: could not reach run_claude_daemon.py: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not reply.get("ok"):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+        sys.exit(1)
+
+    # Output of a piped run
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.exit(reply.get("return_code", 0))
+
+
+if __name__ == "__main__":
+    main()
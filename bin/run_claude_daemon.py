@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Long-running version of run_claude_advanced.py.
+
+Imports pyautogui, loads the configuration and detects the platform once,
+then serves jobs from run_claude_client.py over a Unix socket so each run
+skips interpreter startup and those imports.
+"""
+
+import sys
+import os
+import json
+import stat
+import tempfile
+import contextlib
+import socketserver
+from typing import Optional
+
+import click
+
+from run_claude_advanced import setup_logging, Config, ClaudeAutomation
+
+
+def default_socket_path() -> str:
+    """Socket location shared with run_claude_client.py."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        # Shared /tmp: use a directory of our own so no other user can claim the name
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"cc_enhancer-{os.getuid()}")
+    return os.path.join(runtime_dir, "cc_enhancer.sock")
+
+
+def ensure_private_dir(path: str) -> None:
+    """Create directory path for our socket, or check that it is ours alone."""
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(path, 0o700)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise click.ClickException(f"{path} is not a private directory owned by this user")
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """Run one job per connection: a JSON request line in, a JSON reply line out."""
+
+    def handle(self):
+        automation = self.server.automation
+        try:
+            job = json.loads(self.rfile.readline())
+            windowed = job.get("windowed", True)
+            # A piped claude would otherwise write to the daemon's terminal;
+            # collect its output and send it back to the client instead
+            with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+                return_code = automation.execute_automation(
+                    job["path"],
+                    job["input_string"],
+                    dry_run=job.get("dry_run", False),
+                    windowed=windowed,
+                    stdout=out,
+                    stderr=err,
+                )
+                out.seek(0)
+                err.seek(0)
+                reply = {
+                    "ok": True,
+                    "return_code": return_code,
+                    "stdout": out.read().decode("utf-8", "replace"),
+                    "stderr": err.read().decode("utf-8", "replace"),
+                }
+        except Exception as e:
+            automation.logger.error(f"Job failed: {e}")
+            reply = {"ok": False, "error": str(e)}
+
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class JobServer(socketserver.UnixStreamServer):
+    """Serves jobs one at a time, so keystrokes from two jobs never interleave."""
+
+    def __init__(self, socket_path: str, automation: ClaudeAutomation):
+        self.automation = automation
+        super().__init__(socket_path, JobHandler)
+
+    def service_actions(self):
+        """Reap terminals started by earlier jobs, which are never waited on otherwise."""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+
+@click.command()
+@click.option('--socket', 'socket_path', type=click.Path(), help='Unix socket to listen on')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+@click.option('--config', type=click.Path(exists=True), help='Path to JSON config file')
+@click.option('--log-file', type=click.Path(), help='Path to log file')
+def main(socket_path: Optional[str], verbose, config, log_file):
+    """
+    Keep run_claude_advanced.py warm and run jobs sent by run_claude_client.py.
+
+    Jobs run in a new terminal window (like --windowed) unless the client
+    asks for a piped run.
+
+    Examples:
+
+        python run_claude_daemon.py &
+        python run_claude_client.py /home/user/project "Hello Claude"
+    """
+    logger = setup_logging(verbose, log_file)
+    automation = ClaudeAutomation(Config(config), logger)
+
+    # Pay for the pyautogui import now rather than on the first job
+    try:
+        automation.gui
+    except ImportError as e:
+        logger.warning(f"pyautogui unavailable, only piped and dry-run jobs will work: {e}")
+
+    if not socket_path:
+        socket_path = default_socket_path()
+        ensure_private_dir(os.path.dirname(socket_path))
+
+    # A socket left behind by a previous daemon would make bind() fail
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+
+    # Only this user may submit jobs
+    old_umask = os.umask(0o177)
+    try:
+        server = JobServer(socket_path, automation)
+    finally:
+        os.umask(old_umask)
+
+    logger.info(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
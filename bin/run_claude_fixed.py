@@ -9,21 +9,56 @@ import os
 import subprocess
 import click
 import shlex
+import functools
+import shutil
 from pathlib import Path
 import time
 
 
-def find_claude_command():
-    """Find the claude command location."""
-    # First try which command
+# Where the last resolved claude path is remembered between runs
+_CLAUDE_PATH_CACHE = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "cc_enhancer" / "claude"
+
+
+def _load_cached_path():
+    """Return the cached claude path if it is still executable, else None."""
     try:
-        result = subprocess.run(['which', 'claude'], 
-                              capture_output=True, text=True, check=True)
-        claude_path = result.stdout.strip()
-        if claude_path:
-            return claude_path
-    except subprocess.CalledProcessError:
+        cached = _CLAUDE_PATH_CACHE.read_text().strip()
+    except OSError:
+        return None
+    if cached and os.access(cached, os.X_OK):
+        return cached
+    return None
+
+
+def _store_cached_path(claude_path):
+    """Remember claude_path for the next run; failing to write the cache is harmless."""
+    try:
+        _CLAUDE_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _CLAUDE_PATH_CACHE.write_text(claude_path)
+    except OSError:
         pass
+
+
+@functools.lru_cache(maxsize=1)
+def find_claude_command():
+    """Find the claude command location."""
+    # A path found on a previous run saves the lookup below
+    cached = _load_cached_path()
+    if cached:
+        return cached
+    
+    claude_path = _find_claude_uncached()
+    if claude_path:
+        _store_cached_path(claude_path)
+    return claude_path
+
+
+def _find_claude_uncached():
+    """Look claude up on PATH and in the usual install locations."""
+    # First try PATH (the same lookup `which` does, without forking it)
+    claude_path = shutil.which('claude')
+    if claude_path:
+        return claude_path
     
     # Common locations to check
     common_paths = [
@@ -40,34 +75,59 @@ def find_claude_command():
     return None
 
 
+@functools.lru_cache(maxsize=256)
 def convert_wsl_path(linux_path):
     """Convert WSL Linux path to Windows path format."""
     try:
-        result = subprocess.run(['wslpath', '-w', linux_path], 
-                              capture_output=True, text=True, check=True)
+        # Only stdout is needed, and the short-lived child inherits nothing worth closing
+        result = subprocess.run(['wslpath', '-w', linux_path], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True, close_fds=False)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         return linux_path
 
 
+@functools.lru_cache(maxsize=1)
 def get_shell_init_command():
     """Get the command to initialize the shell environment."""
-    # Check which shell configuration files exist
-    configs = [
-        "~/.bashrc",
-        "~/.bash_profile",
-        "~/.profile",
-        "~/.zshrc",
-    ]
+    # Shell configuration files, in order of preference
+    configs = {
+        ".bashrc": "~/.bashrc",
+        ".bash_profile": "~/.bash_profile",
+        ".profile": "~/.profile",
+        ".zshrc": "~/.zshrc",
+    }
+    
+    # One directory listing instead of a stat() per candidate
+    try:
+        with os.scandir(os.path.expanduser("~")) as entries:
+            present = {entry.name for entry in entries
+                       if entry.name in configs and not entry.is_dir()}
+    except OSError:
+        return ""
     
-    for config in configs:
-        config_path = os.path.expanduser(config)
-        if os.path.exists(config_path):
+    for name, config in configs.items():
+        if name in present:
             return f"source {config}"
     
     return ""
 
 
+def build_bash_template(shell_init, run_cmd):
+    """Join the fixed parts of the terminal's bash command; {path} and {input} are left to fill in."""
+    parts = []
+    
+    # Add shell initialization if found
+    if shell_init:
+        parts.append(shell_init.replace("{", "{{").replace("}", "}}"))
+    
+    # Change directory, then run claude with input
+    parts.append("cd {path}")
+    parts.append(run_cmd)
+    
+    return " && ".join(parts)
+
+
 @click.command()
 @click.argument('path', type=click.Path(exists=True, file_okay=False, 
                                        dir_okay=True, resolve_path=True))
@@ -95,11 +155,8 @@ def main(path, input_string, wait_time, verbose, use_full_path, claude_path):
         python run_claude_fixed.py --claude-path /usr/bin/claude /path "Input"
     """
     
-    # Validate path
+    # click.Path has already checked that path exists and is a directory
     path_obj = Path(path)
-    if not path_obj.exists():
-        click.echo(f"Error: Path '{path}' does not exist", err=True)
-        sys.exit(1)
     
     # Determine claude command
     if claude_path:
@@ -122,6 +179,11 @@ def main(path, input_string, wait_time, verbose, use_full_path, claude_path):
         click.echo(f"Input: {input_string}")
         click.echo(f"Wait time: {wait_time}s")
     
+    # Only these two pieces change from run to run; everything else is baked into the template
+    quoted_path = shlex.quote(str(path_obj))
+    quoted_input = shlex.quote(input_string)
+    claude_cmd_fmt = claude_cmd.replace("{", "{{").replace("}", "}}")
+    
     try:
         # Check if running in WSL
         is_wsl = os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop")
@@ -130,24 +192,11 @@ def main(path, input_string, wait_time, verbose, use_full_path, claude_path):
             # Convert path for Windows Terminal
             windows_path = convert_wsl_path(str(path_obj))
             
-            # Escape the input string for bash
-            escaped_input = shlex.quote(input_string)
-            
             # Build the bash command with proper initialization
-            bash_cmd_parts = []
-            
-            # Add shell initialization if found
-            if shell_init:
-                bash_cmd_parts.append(shell_init)
-            
-            # Change directory
-            bash_cmd_parts.append(f"cd {shlex.quote(str(path_obj))}")
-            
-            # Run claude with input
-            bash_cmd_parts.append(f"echo 'Waiting {wait_time} seconds...' && sleep {wait_time} && echo {escaped_input} | {claude_cmd}")
-            
-            # Join all parts
-            bash_cmd = " && ".join(bash_cmd_parts)
+            bash_template = build_bash_template(
+                shell_init,
+                f"echo 'Waiting {wait_time} seconds...' && sleep {wait_time} && echo {{input}} | {claude_cmd_fmt}")
+            bash_cmd = bash_template.format(path=quoted_path, input=quoted_input)
             
             # Build Windows Terminal command
             cmd = [
@@ -159,8 +208,11 @@ def main(path, input_string, wait_time, verbose, use_full_path, claude_path):
             
             if verbose:
                 click.echo(f"Running command: {' '.join(cmd)}")
+                click.echo("Command launched successfully!")
             
-            subprocess.Popen(cmd)
+            # Nothing left to do here, so hand the process over to wt.exe
+            sys.stdout.flush()
+            os.execvp(cmd[0], cmd)
             
         else:
             # For non-WSL Linux, use a different approach
@@ -171,37 +223,28 @@ def main(path, input_string, wait_time, verbose, use_full_path, claude_path):
                 ["xterm", "-e", "bash", "-c"],
             ]
             
-            terminal_found = False
+            # The bash command is the same whichever terminal ends up running it
+            bash_template = build_bash_template(
+                shell_init,
+                f"sleep {wait_time} && echo {{input}} | {claude_cmd_fmt} && read -p 'Press Enter to exit...'")
+            bash_cmd = bash_template.format(path=quoted_path, input=quoted_input)
+            
             for terminal_cmd in terminals:
                 try:
-                    # Build bash command
-                    bash_cmd_parts = []
-                    if shell_init:
-                        bash_cmd_parts.append(shell_init)
-                    
-                    bash_cmd_parts.append(f"cd {shlex.quote(str(path_obj))}")
-                    bash_cmd_parts.append(f"sleep {wait_time} && echo {shlex.quote(input_string)} | {claude_cmd} && read -p 'Press Enter to exit...'")
-                    
-                    bash_cmd = " && ".join(bash_cmd_parts)
-                    
                     full_cmd = terminal_cmd + [bash_cmd]
                     
                     if verbose:
                         click.echo(f"Trying: {terminal_cmd[0]}")
                     
-                    subprocess.Popen(full_cmd)
-                    terminal_found = True
-                    break
+                    # Replace this process with the terminal; only returns (raises) if it's missing
+                    sys.stdout.flush()
+                    os.execvp(full_cmd[0], full_cmd)
                     
-                except (subprocess.CalledProcessError, FileNotFoundError):
+                except FileNotFoundError:
                     continue
             
-            if not terminal_found:
-                click.echo("Error: No supported terminal emulator found", err=True)
-                sys.exit(1)
-        
-        if verbose:
-            click.echo("Command launched successfully!")
+            click.echo("Error: No supported terminal emulator found", err=True)
+            sys.exit(1)
             
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -7,9 +7,9 @@ This approach provides more reliable terminal interaction.
 import sys
 import os
 import time
+import select
 import click
 import platform
-from pathlib import Path
 
 try:
     import pexpect
@@ -18,6 +18,12 @@ except ImportError:
     sys.exit(1)
 
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Output that means Claude is up and waiting for input
+_READY_PATTERNS = [rb'Human:', rb'>\s*$', rb'Claude.*ready']
+
+
 class TerminalAutomation:
     """Handle terminal automation with pexpect."""
     
@@ -39,33 +45,40 @@ class TerminalAutomation:
         os.chdir(working_dir)
         
         try:
-            if platform.system().lower() == "windows":
+            if _IS_WINDOWS:
                 # pexpect doesn't work well on Windows, use subprocess instead
                 import subprocess
                 subprocess.Popen(["cmd", "/k", "cd /d", working_dir])
                 time.sleep(2)
                 return None
             else:
-                # Spawn a bash shell
-                self.terminal = pexpect.spawn('/bin/bash', encoding='utf-8')
+                # Spawn a bash shell; bytes mode, so output is only decoded once at the end
+                self.terminal = pexpect.spawn('/bin/bash')
                 self.terminal.setwinsize(24, 80)
                 
                 # Wait for prompt
-                self.terminal.expect(['\\$', '#', '>'], timeout=5)
+                self.terminal.expect([rb'\$', b'#', b'>'], timeout=5)
                 
                 # Ensure we're in the right directory
                 self.terminal.sendline(f'cd "{working_dir}"')
-                self.terminal.expect(['\\$', '#', '>'], timeout=5)
+                self.terminal.expect([rb'\$', b'#', b'>'], timeout=5)
                 
                 self.log("Terminal spawned successfully")
                 return self.terminal
         finally:
             os.chdir(original_dir)
     
-    def run_claude_command(self, input_string, working_dir):
-        """Run the claude command and send input after delay."""
+    def run_claude_command(self, input_string, working_dir, deadline=None):
+        """
+        Run the claude command and send input after delay.
+        
+        deadline is an optional time.monotonic() value; waiting stops there and
+        TimeoutError is raised if it passes before the input could be sent.
+        """
+        def remaining(cap):
+            return cap if deadline is None else max(0, min(cap, deadline - time.monotonic()))
         
-        if platform.system().lower() == "windows":
+        if _IS_WINDOWS:
             # Fallback to pyautogui on Windows
             self.log("Windows detected, using GUI automation fallback")
             self._windows_fallback(input_string)
@@ -76,71 +89,70 @@ class TerminalAutomation:
         if not term:
             raise RuntimeError("Failed to spawn terminal")
         
-        captured_output = []
+        output_buffer = bytearray()
         
         try:
             # Send claude command
             self.log("Sending 'claude' command...")
             term.sendline('claude')
             
-            # Wait 5 seconds as requested
-            self.log("Waiting 5 seconds...")
-            time.sleep(5)
+            # Wait until Claude's prompt shows up, but no longer than 5 seconds
+            self.log("Waiting up to 5 seconds for Claude to start...")
+            started = time.monotonic()
+            index = term.expect(_READY_PATTERNS + [pexpect.EOF, pexpect.TIMEOUT], timeout=remaining(5))
+            if index < len(_READY_PATTERNS):
+                self.log(f"Claude ready after {time.monotonic() - started:.2f}s")
+            # Keep what expect() consumed; it is part of the session output.
+            # On timeout nothing is consumed, it all stays in term.buffer.
+            if index <= len(_READY_PATTERNS):
+                output_buffer += term.before
+                if isinstance(term.after, bytes):
+                    output_buffer += term.after
+            
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("Operation timed out")
             
             # Send the input string
             self.log(f"Sending input: {input_string}")
             term.sendline(input_string)
             
-            # Capture output with a longer timeout
+            # Capture output straight off the pty; select() sleeps in the kernel until
+            # bytes arrive rather than waking every second to rescan the buffer
             self.log("Capturing Claude's response...")
-            output_buffer = ""
-            start_time = time.time()
+            fd = term.child_fd
+            output_buffer += term.buffer
+            term.buffer = b''
             timeout_seconds = 30  # Maximum time to wait for Claude's response
+            min_seconds = 5  # Always give Claude at least this long
+            idle_seconds = 2  # Claude seems done after this long without output
+            start_time = last_data = time.monotonic()
+            capture_deadline = start_time + remaining(timeout_seconds)
             
-            while time.time() - start_time < timeout_seconds:
+            while True:
+                now = time.monotonic()
+                stop_at = min(capture_deadline, max(last_data + idle_seconds, start_time + min_seconds))
+                if now >= stop_at:
+                    break
+                ready, _, _ = select.select([fd], [], [], stop_at - now)
+                if not ready:
+                    continue
                 try:
-                    # Try to read any available output
-                    index = term.expect([pexpect.TIMEOUT, pexpect.EOF, '\n'], timeout=1)
-                    if index == 0:  # Timeout - check if we should continue
-                        if term.before:
-                            output_buffer += term.before
-                            term.before = ""
-                        # Check if Claude seems to be done (no output for 2 seconds)
-                        if len(captured_output) > 0 and time.time() - start_time > 5:
-                            break
-                    elif index == 1:  # EOF
-                        if term.before:
-                            output_buffer += term.before
-                        break
-                    elif index == 2:  # Newline
-                        if term.before:
-                            output_buffer += term.before + '\n'
-                            captured_output.append(term.before)
-                            term.before = ""
-                except:
-                    # Continue on any error
-                    pass
-            
-            # Get any remaining output
-            try:
-                term.expect(pexpect.TIMEOUT, timeout=0.5)
-                if term.before:
-                    output_buffer += term.before
-                    captured_output.extend(term.before.split('\n'))
-            except:
-                pass
+                    chunk = os.read(fd, 8192)
+                except OSError:
+                    chunk = b''  # Linux reports a closed pty as EIO
+                if not chunk:  # EOF
+                    break
+                output_buffer += chunk
+                last_data = time.monotonic()
             
             # Clean up the output
-            full_output = '\n'.join(captured_output).strip()
+            full_output = output_buffer.decode('utf-8', errors='replace').replace('\r\n', '\n').strip()
             
             self.log("Command execution completed")
             self.log(f"Captured output length: {len(full_output)} characters")
             
             return full_output
             
-        except pexpect.exceptions.TIMEOUT:
-            self.log("Warning: Terminal response timeout")
-            return '\n'.join(captured_output) if captured_output else None
         except Exception as e:
             self.log(f"Error during execution: {e}")
             raise
@@ -181,35 +193,15 @@ def main(path, input_string, verbose, timeout):
         python run_claude_pexpect.py /home/user/project "Hello Claude"
     """
     
-    # Validate path
-    path_obj = Path(path)
-    if not path_obj.exists():
-        click.echo(f"Error: Path '{path}' does not exist", err=True)
-        sys.exit(1)
-    
-    if not path_obj.is_dir():
-        click.echo(f"Error: Path '{path}' is not a directory", err=True)
-        sys.exit(1)
+    # click.Path has already checked that path exists and is a directory
     
     # Create automation instance
     automation = TerminalAutomation(verbose=verbose)
     
     try:
-        # Set overall timeout
-        import signal
-        
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Operation timed out")
-        
-        if platform.system().lower() != "windows":
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(timeout)
-        
-        # Run the automation
-        output = automation.run_claude_command(input_string, str(path_obj))
-        
-        if platform.system().lower() != "windows":
-            signal.alarm(0)  # Cancel timeout
+        # Run the automation; the overall timeout is enforced by its own waits
+        output = automation.run_claude_command(input_string, path,
+                                               deadline=time.monotonic() + timeout)
         
         # Print the captured output to stdout
         if output:
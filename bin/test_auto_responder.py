@@ -8,6 +8,10 @@ import re
 import time
 
 
+# Compiled once rather than on every test_pattern_detection call
+_PROMPT_RE = re.compile(r'Do you want to.*\?', re.IGNORECASE)
+
+
 def simulate_claude_permission_prompt():
     """Simulate Claude's behavior with permission prompts."""
     print("Welcome to Claude!")
@@ -45,13 +49,11 @@ def test_pattern_detection():
         ("DO YOU WANT TO PROCEED?", True),  # Case insensitive
     ]
     
-    pattern = re.compile(r'Do you want to.*\?', re.IGNORECASE)
-    
     print("Testing permission prompt detection:")
     print("-" * 50)
     
     for text, expected in test_cases:
-        detected = bool(pattern.search(text))
+        detected = bool(_PROMPT_RE.search(text))
         status = "✓" if detected == expected else "✗"
         print(f"{status} '{text}' -> Detected: {detected}")
     
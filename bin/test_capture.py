@@ -4,6 +4,7 @@ Test script demonstrating how to capture Claude's output.
 """
 
 import subprocess
+import sys
 import os
 import json
 
@@ -14,12 +15,13 @@ def test_method_1():
     print("-" * 50)
     
     # Run the capture script
+    # Absolute interpreter path and close_fds=False let subprocess use posix_spawn instead of fork
     result = subprocess.run([
-        "python3", "capture_claude_output.py",
+        sys.executable, "capture_claude_output.py",
         os.getcwd(),
         "What is 2+2?",
         "--wait-time", "2"
-    ], capture_output=True, text=True)
+    ], capture_output=True, text=True, close_fds=False)
     
     print("STDOUT:")
     print(result.stdout)
@@ -34,18 +36,20 @@ def test_method_2():
     print("Method 2: Using run_claude_capture.py with JSON")
     print("-" * 50)
     
-    # Run with JSON output for easy parsing
-    result = subprocess.run([
-        "python3", "run_claude_capture.py",
+    # Run with JSON output for easy parsing; parse straight from the pipe
+    # so the transcript isn't held as a string before being decoded
+    proc = subprocess.Popen([
+        sys.executable, "run_claude_capture.py",
         os.getcwd(),
         "List Python files",
         "--json-output",
         "--wait-time", "2"
-    ], capture_output=True, text=True)
+    ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, close_fds=False)
     
     try:
-        # Parse JSON output
-        output_data = json.loads(result.stdout)
+        with proc.stdout:
+            # Parse JSON output
+            output_data = json.load(proc.stdout)
         print(f"Success: {output_data['success']}")
         print(f"Return code: {output_data['returncode']}")
         print(f"Output length: {len(output_data['stdout'])} characters")
@@ -57,7 +61,8 @@ def test_method_2():
         
     except json.JSONDecodeError:
         print("Failed to parse JSON output")
-        print(result.stdout)
+    finally:
+        proc.wait()
     print()
 
 
@@ -5,16 +5,43 @@ Test if Claude needs a pseudo-terminal (PTY)
 
 import os
 import pty
+import codecs
 import subprocess
 import select
 import time
 import sys
 
+def drain(master, decoder, idle=0.3, total=10.0):
+    """Print output from master until it goes quiet for idle seconds (or total passes)"""
+    deadline = time.monotonic() + total
+    chunks = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # Wait as long as it takes for the first byte, then only for an idle gap
+        r, _, _ = select.select([master], [], [], min(idle, remaining) if chunks else remaining)
+        if not r:
+            break
+        try:
+            data = os.read(master, 4096)
+        except OSError:  # EIO once the child has closed the PTY
+            break
+        if not data:
+            break
+        text = decoder.decode(data)
+        chunks.append(text)
+        print(f"Got: {repr(text)}")
+    return chunks
+
 def test_with_pty():
     """Test Claude with a pseudo-terminal"""
     print("Testing Claude with PTY")
     print("-" * 50)
     
+    # Incremental so a UTF-8 character split across two reads still decodes
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    
     # Create a pseudo-terminal
     master, slave = pty.openpty()
     
@@ -33,26 +60,9 @@ def test_with_pty():
         # Close slave end in parent
         os.close(slave)
         
-        # Make master non-blocking
-        import fcntl
-        flags = fcntl.fcntl(master, fcntl.F_GETFL)
-        fcntl.fcntl(master, fcntl.F_SETFL, flags | os.O_NONBLOCK)
-        
         # Read initial output
         print("\nReading initial output...")
-        time.sleep(2)
-        
-        output = []
-        while True:
-            try:
-                data = os.read(master, 1024).decode('utf-8', errors='replace')
-                if data:
-                    output.append(data)
-                    print(f"Got: {repr(data)}")
-                else:
-                    break
-            except BlockingIOError:
-                break
+        output = drain(master, decoder)
         
         if output:
             print(f"\nInitial output received ({len(''.join(output))} chars)")
@@ -64,26 +74,19 @@ def test_with_pty():
         os.write(master, b"echo test\n")
         
         # Read response
-        time.sleep(3)
         print("\nReading response...")
+        response = drain(master, decoder)
         
-        response = []
-        while True:
-            try:
-                data = os.read(master, 1024).decode('utf-8', errors='replace')
-                if data:
-                    response.append(data)
-                    print(f"Got: {repr(data)}")
-                else:
-                    break
-            except BlockingIOError:
-                break
-                
         if response:
             print(f"\nResponse received ({len(''.join(response))} chars)")
         else:
             print("\nNo response")
         
+        # Flush a trailing partial character, if any
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            print(f"Got: {repr(tail)}")
+        
         # Cleanup
         proc.terminate()
         proc.wait(timeout=5)
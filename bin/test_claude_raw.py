@@ -3,67 +3,62 @@
 Test raw Claude subprocess to see all output
 """
 
-import subprocess
-import threading
-import time
+import asyncio
+import codecs
 import sys
 
-def read_stream(stream, name):
+async def read_stream(reader, name):
     """Read from a stream and print with labels"""
+    # Incremental so a UTF-8 character split across two reads still decodes
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
     try:
-        while True:
-            data = stream.read(1)  # Read one character at a time
-            if not data:
-                break
-            print(f"[{name}] {repr(data)}", end='', flush=True)
+        while data := await reader.read(4096):  # Whatever is available, up to 4 KiB
+            sys.stdout.write(f"[{name}] {decoder.decode(data)!r}")
+            sys.stdout.flush()
     except Exception as e:
         print(f"\n[{name} ERROR] {e}")
 
-def main():
+async def main():
     print("Starting raw Claude subprocess test")
     print("-" * 50)
     
     # Start Claude
-    proc = subprocess.Popen(
-        ['claude'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0  # Unbuffered
+    proc = await asyncio.create_subprocess_exec(
+        'claude',
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
     )
     
     print(f"Process started with PID: {proc.pid}")
     
-    # Start threads to read output
-    stdout_thread = threading.Thread(target=read_stream, args=(proc.stdout, 'STDOUT'))
-    stderr_thread = threading.Thread(target=read_stream, args=(proc.stderr, 'STDERR'))
-    
-    stdout_thread.daemon = True
-    stderr_thread.daemon = True
-    
-    stdout_thread.start()
-    stderr_thread.start()
+    # Read both pipes on this event loop instead of in threads
+    readers = asyncio.gather(
+        read_stream(proc.stdout, 'STDOUT'),
+        read_stream(proc.stderr, 'STDERR')
+    )
     
     # Wait a bit to see initial output
     print("\nWaiting 5 seconds for initial output...")
-    time.sleep(5)
+    await asyncio.sleep(5)
     
     # Send test input
     print("\n\nSending test input: 'echo test'")
-    proc.stdin.write("echo test\n")
-    proc.stdin.flush()
+    proc.stdin.write(b"echo test\n")
+    await proc.stdin.drain()
     
     # Wait for response
     print("\nWaiting 5 seconds for response...")
-    time.sleep(5)
+    await asyncio.sleep(5)
     
     # Terminate
     print("\n\nTerminating process...")
-    proc.terminate()
-    proc.wait(timeout=5)
+    if proc.returncode is None:
+        proc.terminate()
+    await asyncio.wait_for(proc.wait(), timeout=5)
+    await readers
     
     print("\nTest complete")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
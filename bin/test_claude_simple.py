@@ -4,6 +4,7 @@ Test Claude with simple non-interactive mode
 """
 
 import subprocess
+import shutil
 import sys
 
 def test_claude_print_mode():
@@ -14,12 +15,14 @@ def test_claude_print_mode():
     test_prompt = "echo 'Hello from Claude!'"
     
     try:
-        # Use --print flag for non-interactive mode
+        # Use --print flag for non-interactive mode; an absolute path and
+        # close_fds=False let subprocess use posix_spawn instead of fork
         result = subprocess.run(
-            ['claude', '--print', test_prompt],
+            [shutil.which('claude') or 'claude', '--print', test_prompt],
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=30,
+            close_fds=False
         )
         
         print(f"Return code: {result.returncode}")
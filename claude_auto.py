@@ -4,11 +4,167 @@ Simple Claude wrapper that always auto-approves permissions.
 For when you trust the operations and want minimal friction.
 """
 
+import os
 import sys
+import pickle
+import tempfile
 import subprocess
-import xml.etree.ElementTree as ET
-sys.path.insert(0, 'bin')
-from capture_claude_simple import capture_claude_print
+from concurrent.futures import ThreadPoolExecutor
+try:
+    # C-backed parser; the stdlib one handles this file just as well, only slower
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+from pathlib import Path
+from git_diff_last_commit import get_last_commit_diff, GitDiffError
+
+
+# The prompt library ships next to this script; the git diff is of the current directory
+_HERE = Path(__file__).resolve().parent
+_PROMPT_LIBRARY = _HERE / "prompt_library.xml"
+
+# Results from earlier runs, reused while their inputs haven't changed
+_CACHE_DIR = Path.home() / ".cache" / "cc_enhancer"
+_PROMPTS_CACHE = _CACHE_DIR / "prompts.pkl"  # keyed by prompt_library.xml path, mtime and size
+_PROMPTS_CACHE_VERSION = 2  # Bump when _parse_prompt_library's results change
+_DIFF_CACHE = _CACHE_DIR / "git_diff.pkl"  # keyed by repository path and HEAD commit
+
+
+def _caching_enabled():
+    """PROMPT_LIBRARY_NOCACHE=1 forces a fresh parse and diff (for debugging)."""
+    return os.environ.get('PROMPT_LIBRARY_NOCACHE') != '1'
+
+
+def _read_cache(cache_file, key):
+    """Return the value stored under key in cache_file, or None on a miss."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, value = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    return value if cached_key == key else None
+
+
+def _write_cache(cache_file, key, value):
+    """Atomically store (key, value) in cache_file; failing to cache is harmless."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, value), f)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _git_head():
+    """Return the HEAD commit id, reading .git directly when possible (None if unknown)."""
+    try:
+        head = Path('.git/HEAD').read_text().strip()
+        if not head.startswith('ref: '):
+            return head  # Detached HEAD
+        ref_file = Path('.git') / head[5:]
+        if ref_file.exists():
+            return ref_file.read_text().strip()
+    except OSError:
+        pass
+    
+    # Packed refs, worktrees, subdirectories: let git work it out
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_prompt_library():
+    """Parse prompt_library.xml into (prompts, roles) dicts of key -> text."""
+    prompts = {}
+    roles = {}
+    open_tags = []  # Tags of the elements enclosing the current position
+    
+    # Stream the file, dropping each prompt once its text is indexed, so memory
+    # stays flat however many roles the library grows
+    for event, elem in ET.iterparse(str(_PROMPT_LIBRARY), events=('start', 'end')):
+        if event == 'start':
+            open_tags.append(elem.tag)
+            continue
+        open_tags.pop()
+        if elem.tag != 'prompt':
+            continue
+        
+        # The first prompt with a key wins, like find(); roles are the prompts
+        # directly inside any <roles>, like find('.//roles/prompt[@key=...]')
+        key = elem.get('key')
+        prompts.setdefault(key, elem.text)
+        if open_tags and open_tags[-1] == 'roles':
+            roles.setdefault(key, elem.text)
+        
+        elem.clear()
+        if hasattr(elem, 'getprevious'):
+            # lxml keeps cleared siblings linked in; detach them too
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+    
+    return prompts, roles
+
+
+def load_prompts():
+    """Return (prompts, roles) from prompt_library.xml, parsing only when the file changed."""
+    st = os.stat(_PROMPT_LIBRARY)
+    key = (str(_PROMPT_LIBRARY), st.st_mtime_ns, st.st_size, _PROMPTS_CACHE_VERSION)
+    
+    if _caching_enabled():
+        cached = _read_cache(_PROMPTS_CACHE, key)
+        if cached is not None:
+            return cached
+    
+    parsed = _parse_prompt_library()
+    if _caching_enabled():
+        _write_cache(_PROMPTS_CACHE, key, parsed)
+    return parsed
+
+
+def _diff_cache_key():
+    """Key for the git diff cache, or None when HEAD can't be determined."""
+    head = _git_head()
+    return (os.getcwd(), head) if head is not None and _caching_enabled() else None
+
+
+def load_context():
+    """Return the prompts and git diff claude_auto needs."""
+    # Start getting the diff between the last two commits, unless HEAD hasn't moved.
+    # git runs in a worker thread (subprocess waits release the GIL) while the XML is parsed.
+    diff_key = _diff_cache_key()
+    git_diff_output = _read_cache(_DIFF_CACHE, diff_key) if diff_key else None
+    
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        diff_future = pool.submit(get_last_commit_diff) if git_diff_output is None else None
+        
+        # Parse the prompt library XML while git runs
+        prompts, roles = load_prompts()
+        
+        if diff_future:
+            try:
+                git_diff_output = diff_future.result()
+            except GitDiffError as e:
+                print(f"Error getting git diff: {e}", file=sys.stderr)
+                git_diff_output = "Error retrieving git diff"  # Not cached, so the next run retries
+            else:
+                if diff_key:
+                    _write_cache(_DIFF_CACHE, diff_key, git_diff_output)
+    
+    return {
+        'claude_pre_prompt': prompts['claude pre prompt'],
+        'pre_git_diff': prompts['pre git diff'],
+        'roles': roles,
+        'git_diff': git_diff_output,
+    }
 
 
 def main():
@@ -19,57 +175,60 @@ def main():
         print("Example: python claude_auto.py 'error handling' 'create hello.py'")
         sys.exit(1)
     
-    # First, call git_diff_last_commit.py to get the diff
-    try:
-        result = subprocess.run(
-            ['python', 'git_diff_last_commit.py'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        git_diff_output = result.stdout
-    except subprocess.CalledProcessError as e:
-        print(f"Error running git_diff_last_commit.py: {e}", file=sys.stderr)
-        git_diff_output = "Error retrieving git diff"
-    
-    # Parse the prompt library XML
+    # Imported only once the arguments check out, so the usage message stays quick
+    sys.path.insert(0, str(_HERE / 'bin'))
+    from capture_claude_simple import capture_claude_print, claude_print_command
+    
     try:
-        tree = ET.parse('prompt_library.xml')
-        root = tree.getroot()
-        
-        # Extract prompts from XML
-        claude_pre_prompt = root.find(".//prompt[@key='claude pre prompt']").text
-        pre_git_diff = root.find(".//prompt[@key='pre git diff']").text
-        
-        # Extract role parameter and find corresponding prompt
-        role = sys.argv[1]
-        role_prompt_element = root.find(f".//roles/prompt[@key='{role}']")
-        
-        if role_prompt_element is None:
-            print(f"Error: Role '{role}' not found in prompt_library.xml", file=sys.stderr)
-            print("Available roles: error handling, security review")
-            sys.exit(1)
-            
-        role_prompt = role_prompt_element.text
+        context = load_context()
     except Exception as e:
         print(f"Error parsing prompt_library.xml: {e}", file=sys.stderr)
         sys.exit(1)
     
+    claude_pre_prompt = context['claude_pre_prompt']
+    pre_git_diff = context['pre_git_diff']
+    git_diff_output = context['git_diff']
+    
+    # Extract role parameter and find corresponding prompt
+    role = sys.argv[1]
+    role_prompt = context['roles'].get(role)
+    
+    if role_prompt is None:
+        print(f"Error: Role '{role}' not found in prompt_library.xml", file=sys.stderr)
+        print("Available roles: error handling, security review")
+        sys.exit(1)
+    
     # Build the combined prompt
     user_prompt = ' '.join(sys.argv[2:])  # Join all args after role as prompt
     
-    combined_prompt = f"{claude_pre_prompt}: {user_prompt}\n\n{pre_git_diff}:\n{git_diff_output}\n\n{role_prompt}"
+    # One join sizes and copies the (possibly large) diff exactly once
+    combined_prompt = "".join([
+        claude_pre_prompt, ": ", user_prompt, "\n\n",
+        pre_git_diff, ":\n", git_diff_output, "\n\n",
+        role_prompt,
+    ])
+    
+    # Printing straight to a terminal: hand the process over to claude so its
+    # output goes to the terminal as it is produced, never buffered in Python
+    if sys.stdout.isatty() and os.name == 'posix':
+        cmd = claude_print_command(combined_prompt, skip_permissions=True)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execvp(cmd[0], cmd)
+        except OSError as e:
+            print(f"Error: could not run {cmd[0]}: {e}", file=sys.stderr)
+            sys.exit(127)
     
-    # Send to Claude
-    output, code = capture_claude_print(
+    # Send to Claude, passing its response through as it is written
+    _, code = capture_claude_print(
         combined_prompt,
         skip_permissions=True,
-        verbose=True  # Enable verbose for debugging
+        verbose=True,  # Enable verbose for debugging
+        stream=sys.stdout
     )
     
-    if code == 0:
-        print(output)
-    else:
+    if code != 0:
         print(f"Error: Claude returned code {code}", file=sys.stderr)
         sys.exit(code)
 
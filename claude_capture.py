@@ -3,23 +3,36 @@
 User-friendly Claude capture wrapper with smart permission handling.
 """
 
+import os
 import sys
 import re
-sys.path.insert(0, 'bin')
-from capture_claude_simple import capture_claude_print
+import functools
 
 
+# capture_claude_simple lives in bin/ next to this script
+_BIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bin')
+
+# Keywords that typically require permissions. Matched anywhere in the prompt,
+# so 'file' also catches 'files' and 'profile'.
+PERMISSION_KEYWORDS = frozenset({
+    'create', 'write', 'edit', 'modify', 'delete', 'remove',
+    'make', 'build', 'compile', 'run', 'execute', 'install',
+    'file', 'directory', 'folder', 'save', 'update'
+})
+# All keywords in one alternation: a single pass over the prompt however many there are
+_KW_RE = re.compile("|".join(map(re.escape, sorted(PERMISSION_KEYWORDS))), re.IGNORECASE)
+
+# Phrases in Claude's reply that mean it stopped to ask for permissions
+_PERM_RE = re.compile(
+    r"need permission|grant.*access|please.*permission|requires.*permission",
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=256)
 def detect_needs_permissions(prompt):
     """Detect if a prompt likely needs file/system permissions."""
-    # Keywords that typically require permissions
-    permission_keywords = [
-        'create', 'write', 'edit', 'modify', 'delete', 'remove',
-        'make', 'build', 'compile', 'run', 'execute', 'install',
-        'file', 'directory', 'folder', 'save', 'update'
-    ]
-    
-    prompt_lower = prompt.lower()
-    return any(keyword in prompt_lower for keyword in permission_keywords)
+    return _KW_RE.search(prompt) is not None
 
 
 def smart_claude_capture(prompt, auto_detect=True, force_permissions=None):
@@ -34,6 +47,11 @@ def smart_claude_capture(prompt, auto_detect=True, force_permissions=None):
     Returns:
         tuple: (output, return_code, used_permissions)
     """
+    # Imported on first use, so the usage message doesn't pay for it
+    if _BIN_DIR not in sys.path:
+        sys.path.insert(0, _BIN_DIR)
+    from capture_claude_simple import capture_claude_print
+    
     # Determine if we should use permissions
     if force_permissions is not None:
         use_permissions = force_permissions
@@ -52,15 +70,7 @@ def smart_claude_capture(prompt, auto_detect=True, force_permissions=None):
     
     # Check if Claude is asking for permissions
     if not use_permissions and code == 0:
-        needs_permission_patterns = [
-            r"need permission",
-            r"grant.*access",
-            r"please.*permission",
-            r"requires.*permission"
-        ]
-        
-        output_lower = output.lower()
-        if any(re.search(pattern, output_lower) for pattern in needs_permission_patterns):
+        if _PERM_RE.search(output):
             print("\nClaude needs permissions. Re-running with auto-permissions...")
             output, code = capture_claude_print(
                 prompt,
@@ -1,62 +1,61 @@
 #!/usr/bin/env python3
 """Debug script to test Claude execution."""
 
+import re
+import shlex
 import subprocess
-import os
 
 git_bash = r'C:\Program Files\Git\bin\bash.exe'
 
-# Test 1: Simple claude version
-print("Test 1: claude --version")
-result = subprocess.run(
-    [git_bash, '-c', 'claude --version'],
-    capture_output=True,
-    text=True
-)
-print(f"Return code: {result.returncode}")
-print(f"Stdout: {result.stdout}")
-print(f"Stderr: {result.stderr}")
-print("-" * 50)
-
-# Test 2: claude with print
-print("\nTest 2: claude --print 'test'")
-result = subprocess.run(
-    [git_bash, '-c', "claude --print 'test'"],
-    capture_output=True,
-    text=True
-)
-print(f"Return code: {result.returncode}")
-print(f"Stdout: {result.stdout}")
-print(f"Stderr: {result.stderr}")
-print("-" * 50)
-
-# Test 3: Set PATH and run claude
-print("\nTest 3: With PATH set")
-bash_script = '''
+# (title, bash commands) - each test runs in its own subshell so settings don't leak
+tests = [
+    ("Test 1: claude --version", "claude --version"),
+    ("Test 2: claude --print 'test'", "claude --print 'test'"),
+    ("Test 3: With PATH set", '''
 export PATH="/c/Users/yonzb/AppData/Roaming/npm:$PATH"
 which claude
 claude --version
-'''
+'''),
+    ("Test 4: With NODE_PATH set",
+     "export NODE_PATH=" + shlex.quote(r'C:\Users\yonzb\AppData\Roaming\npm\node_modules') + "\n"
+     "claude --version"),
+]
+
+# Starting git-bash is slow on Windows, so run every test in one bash and split
+# its output on markers written before each test and after it (with its exit code)
+bash_script = ""
+for i, (_, commands) in enumerate(tests):
+    bash_script += f'echo "===TEST{i}==="; echo "===TEST{i}===" >&2\n'
+    bash_script += f'( {commands}\n)\necho "===RC{i} $?==="\n'
+
 result = subprocess.run(
     [git_bash, '-c', bash_script],
     capture_output=True,
     text=True
 )
-print(f"Return code: {result.returncode}")
-print(f"Stdout: {result.stdout}")
-print(f"Stderr: {result.stderr}")
-print("-" * 50)
-
-# Test 4: Run with NODE_PATH
-print("\nTest 4: With NODE_PATH set")
-env = os.environ.copy()
-env['NODE_PATH'] = r'C:\Users\yonzb\AppData\Roaming\npm\node_modules'
-result = subprocess.run(
-    [git_bash, '-c', 'claude --version'],
-    capture_output=True,
-    text=True,
-    env=env
-)
-print(f"Return code: {result.returncode}")
-print(f"Stdout: {result.stdout}")
-print(f"Stderr: {result.stderr}")
\ No newline at end of file
+
+
+def split_sections(output):
+    """Map test index -> the output that test wrote to one stream."""
+    parts = re.split(r'===TEST(\d+)===\n', output)
+    return {int(index): text for index, text in zip(parts[1::2], parts[2::2])}
+
+
+stdout_sections = split_sections(result.stdout)
+stderr_sections = split_sections(result.stderr)
+
+for i, (title, _) in enumerate(tests):
+    stdout = stdout_sections.get(i, "")
+    match = re.search(rf'===RC{i} (\d+)===\n', stdout)
+    if match:
+        returncode = int(match.group(1))
+        stdout = stdout[:match.start()]
+    else:
+        returncode = result.returncode  # bash died before finishing this test
+    
+    print(("\n" if i else "") + title)
+    print(f"Return code: {returncode}")
+    print(f"Stdout: {stdout}")
+    print(f"Stderr: {stderr_sections.get(i, '')}")
+    if i < len(tests) - 1:
+        print("-" * 50)
@@ -3,10 +3,14 @@
 Examples of capturing Claude's output programmatically.
 """
 
+import os
 import sys
-import time
-sys.path.insert(0, 'bin')
-from capture_claude_simple import capture_claude_print
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bin'))
+from capture_claude_simple import capture_claude_print, capture_claude_session
+
+# Claude calls in flight at once in example_simple_capture; keeps us polite to the API
+MAX_CONCURRENT_CALLS = 4
 
 
 def example_simple_capture():
@@ -21,24 +25,24 @@ def example_simple_capture():
         "List 3 benefits of Python"
     ]
     
-    for prompt in prompts:
-        print(f"\nPrompt: {prompt}")
-        print("Response: ", end="")
-        
-        # Capture Claude's response
-        output, return_code = capture_claude_print(prompt, verbose=False)
+    # Each call is its own claude process waiting on the API, so run them side by side
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CALLS) as pool:
+        results = pool.map(lambda p: capture_claude_print(p, verbose=False), prompts)
         
-        if return_code == 0:
-            # Process the output
-            lines = output.strip().split('\n')
-            if len(lines) == 1:
-                print(lines[0])
+        # Results come back in prompt order
+        for prompt, (output, return_code) in zip(prompts, results):
+            print(f"\nPrompt: {prompt}")
+            print("Response: ", end="")
+            
+            if return_code == 0:
+                # Process the output
+                lines = output.strip().split('\n')
+                if len(lines) == 1:
+                    print(lines[0])
+                else:
+                    print(f"\n{output.strip()}")
             else:
-                print(f"\n{output.strip()}")
-        else:
-            print(f"[Error: Claude returned code {return_code}]")
-        
-        time.sleep(1)  # Be nice to the API
+                print(f"[Error: Claude returned code {return_code}]")
 
 
 def example_batch_processing():
@@ -52,16 +56,18 @@ def example_batch_processing():
         "capture_claude_simple.py"
     ]
     
-    for filename in files_to_analyze:
-        prompt = f"Briefly describe what {filename} does in one sentence"
-        print(f"\nAnalyzing: {filename}")
-        
-        output, return_code = capture_claude_print(prompt)
-        
-        if return_code == 0:
-            print(f"Description: {output.strip()}")
-        else:
-            print(f"Failed to analyze {filename}")
+    # One claude process answers every file in turn, instead of starting a new one per file
+    with capture_claude_session() as session:
+        for filename in files_to_analyze:
+            prompt = f"Briefly describe what {filename} does in one sentence"
+            print(f"\nAnalyzing: {filename}")
+            
+            output, return_code = session.ask(prompt)
+            
+            if return_code == 0:
+                print(f"Description: {output.strip()}")
+            else:
+                print(f"Failed to analyze {filename}")
 
 
 def example_code_generation():
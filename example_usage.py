@@ -6,12 +6,15 @@ This script demonstrates how to integrate and use the logging system
 in a real application scenario.
 """
 
+import sys
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from logger import (
     DualTagLogger, LogLevel, LogFilter, 
     configure_logger, get_logger,
-    ConsoleLogHandler, FileLogHandler
+    ConsoleLogHandler, FileLogHandler, dumps_indented
 )
 from log_analyzer import LogAnalyzer, LogViewer, LogSortKey
 
@@ -35,18 +38,34 @@ class Modules:
     UTILS = "utils"
 
 
+# (feature, module, function) tags for each logging call site, built once
+_AUTH_TAGS = (Features.USER_AUTH, Modules.AUTH_MODULE, "authenticate_user")
+_PERMISSION_TAGS = (Features.USER_AUTH, Modules.DATABASE, "check_permissions")
+_PROCESS_TAGS = (Features.DATA_PROCESSING, Modules.ANALYTICS, "process_data")
+_SAVE_FILE_TAGS = (Features.FILE_OPERATIONS, Modules.FILE_HANDLER, "save_file")
+_REQUEST_TAGS = (Features.API_CALLS, Modules.API_CLIENT, "make_request")
+_REPORT_TAGS = (Features.REPORT_GENERATION, Modules.ANALYTICS, "generate_report")
+_REPORT_DB_TAGS = (Features.REPORT_GENERATION, Modules.DATABASE, "generate_report")
+_REPORT_FILE_TAGS = (Features.REPORT_GENERATION, Modules.FILE_HANDLER, "generate_report")
+
+# Simulated API response codes, weighted 3:1:1 towards success
+_STATUS_CODES = (200, 200, 200, 404, 500)
+
+# Random source for the module-level helpers; services carry their own
+_rng = random.Random()
+
+
 class UserAuthenticationService:
     """Example service demonstrating logging"""
     
-    def __init__(self, logger: DualTagLogger):
+    def __init__(self, logger: DualTagLogger, seed: Optional[int] = None):
         self.logger = logger
+        self._rng = random.Random(seed)  # Own generator: no shared lock, reproducible with a seed
     
     def authenticate_user(self, username: str, password: str) -> bool:
         """Authenticate a user"""
         self.logger.info(
-            Features.USER_AUTH,
-            Modules.AUTH_MODULE,
-            "authenticate_user",
+            *_AUTH_TAGS,
             "Starting user authentication",
             username=username,
             ip_address="192.168.1.100"
@@ -58,9 +77,7 @@ class UserAuthenticationService:
         # Simulate checking credentials
         if username == "admin" and password == "password":
             self.logger.info(
-                Features.USER_AUTH,
-                Modules.AUTH_MODULE,
-                "authenticate_user",
+                *_AUTH_TAGS,
                 "User authenticated successfully",
                 username=username,
                 duration=0.1
@@ -68,9 +85,7 @@ class UserAuthenticationService:
             return True
         else:
             self.logger.warning(
-                Features.USER_AUTH,
-                Modules.AUTH_MODULE,
-                "authenticate_user",
+                *_AUTH_TAGS,
                 "Authentication failed",
                 username=username,
                 reason="Invalid credentials"
@@ -80,31 +95,25 @@ class UserAuthenticationService:
     def check_permissions(self, username: str, resource: str) -> bool:
         """Check user permissions"""
         self.logger.debug(
-            Features.USER_AUTH,
-            Modules.DATABASE,
-            "check_permissions",
+            *_PERMISSION_TAGS,
             "Checking user permissions",
             username=username,
             resource=resource
         )
         
         # Simulate permission check
-        has_permission = random.choice([True, False])
+        has_permission = self._rng.random() < 0.5
         
         if has_permission:
             self.logger.info(
-                Features.USER_AUTH,
-                Modules.DATABASE,
-                "check_permissions",
+                *_PERMISSION_TAGS,
                 "Permission granted",
                 username=username,
                 resource=resource
             )
         else:
             self.logger.warning(
-                Features.USER_AUTH,
-                Modules.DATABASE,
-                "check_permissions",
+                *_PERMISSION_TAGS,
                 "Permission denied",
                 username=username,
                 resource=resource
@@ -116,17 +125,16 @@ class UserAuthenticationService:
 class DataProcessor:
     """Example data processing service"""
     
-    def __init__(self, logger: DualTagLogger):
+    def __init__(self, logger: DualTagLogger, seed: Optional[int] = None):
         self.logger = logger
+        self._rng = random.Random(seed)
     
     def process_data(self, data_id: str, data_size: int) -> dict:
         """Process some data"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         self.logger.info(
-            Features.DATA_PROCESSING,
-            Modules.ANALYTICS,
-            "process_data",
+            *_PROCESS_TAGS,
             "Starting data processing",
             data_id=data_id,
             data_size=data_size
@@ -134,10 +142,10 @@ class DataProcessor:
         
         try:
             # Simulate data processing
-            time.sleep(random.uniform(0.1, 0.5))
+            time.sleep(self._rng.uniform(0.1, 0.5))
             
             # Simulate occasional errors
-            if random.random() < 0.2:
+            if self._rng.random() < 0.2:
                 raise ValueError("Data validation failed")
             
             result = {
@@ -145,12 +153,10 @@ class DataProcessor:
                 "status": "success"
             }
             
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
             
             self.logger.info(
-                Features.DATA_PROCESSING,
-                Modules.ANALYTICS,
-                "process_data",
+                *_PROCESS_TAGS,
                 "Data processing completed",
                 data_id=data_id,
                 elapsed_time=elapsed_time,
@@ -161,13 +167,12 @@ class DataProcessor:
             
         except Exception as e:
             self.logger.error(
-                Features.DATA_PROCESSING,
-                Modules.ANALYTICS,
-                "process_data",
-                f"Data processing failed: {str(e)}",
+                *_PROCESS_TAGS,
+                "Data processing failed: %s",
+                e,
                 data_id=data_id,
                 error_type=type(e).__name__,
-                elapsed_time=time.time() - start_time
+                elapsed_time=time.perf_counter() - start_time
             )
             raise
 
@@ -181,9 +186,7 @@ class FileManager:
     def save_file(self, filename: str, content: str) -> bool:
         """Save a file"""
         self.logger.info(
-            Features.FILE_OPERATIONS,
-            Modules.FILE_HANDLER,
-            "save_file",
+            *_SAVE_FILE_TAGS,
             "Attempting to save file",
             filename=filename,
             content_size=len(content)
@@ -194,9 +197,7 @@ class FileManager:
             time.sleep(0.05)
             
             self.logger.info(
-                Features.FILE_OPERATIONS,
-                Modules.FILE_HANDLER,
-                "save_file",
+                *_SAVE_FILE_TAGS,
                 "File saved successfully",
                 filename=filename,
                 bytes_written=len(content)
@@ -205,10 +206,9 @@ class FileManager:
             
         except Exception as e:
             self.logger.error(
-                Features.FILE_OPERATIONS,
-                Modules.FILE_HANDLER,
-                "save_file",
-                f"Failed to save file: {str(e)}",
+                *_SAVE_FILE_TAGS,
+                "Failed to save file: %s",
+                e,
                 filename=filename,
                 error_type=type(e).__name__
             )
@@ -218,72 +218,64 @@ class FileManager:
 class APIClient:
     """Example API client"""
     
-    def __init__(self, logger: DualTagLogger):
+    def __init__(self, logger: DualTagLogger, seed: Optional[int] = None):
         self.logger = logger
+        self._rng = random.Random(seed)
     
-    def make_request(self, endpoint: str, method: str = "GET") -> dict:
-        """Make an API request"""
-        request_id = f"req_{random.randint(1000, 9999)}"
+    def make_request(self, endpoint: str, method: str = "GET",
+                     request_id: Optional[str] = None) -> dict:
+        """Make an API request (request_id is generated unless the caller has one ready)"""
+        if request_id is None:
+            request_id = f"req_{self._rng.randint(1000, 9999)}"
         
-        self.logger.info(
-            Features.API_CALLS,
-            Modules.API_CLIENT,
-            "make_request",
+        # log_tagged takes the fields as a plain dict, skipping the **params path.
+        # Each call gets a new dict: the logger keeps it in the stored entry.
+        self.logger.log_tagged(
+            LogLevel.INFO,
+            _REQUEST_TAGS,
             "Making API request",
-            request_id=request_id,
-            endpoint=endpoint,
-            method=method
+            {"request_id": request_id, "endpoint": endpoint, "method": method}
         )
         
         # Simulate API call
-        start_time = time.time()
-        time.sleep(random.uniform(0.1, 0.3))
+        start_time = time.perf_counter()
+        time.sleep(self._rng.uniform(0.1, 0.3))
         
         # Simulate responses
-        status_code = random.choice([200, 200, 200, 404, 500])
-        response_time = time.time() - start_time
+        status_code = self._rng.choice(_STATUS_CODES)
+        response_time = time.perf_counter() - start_time
         
         if status_code == 200:
-            self.logger.info(
-                Features.API_CALLS,
-                Modules.API_CLIENT,
-                "make_request",
+            self.logger.log_tagged(
+                LogLevel.INFO,
+                _REQUEST_TAGS,
                 "API request successful",
-                request_id=request_id,
-                status_code=status_code,
-                response_time=response_time
+                {"request_id": request_id, "status_code": status_code, "response_time": response_time}
             )
             return {"status": "success", "data": {"id": 123}}
         else:
-            self.logger.error(
-                Features.API_CALLS,
-                Modules.API_CLIENT,
-                "make_request",
+            self.logger.log_tagged(
+                LogLevel.ERROR,
+                _REQUEST_TAGS,
                 "API request failed",
-                request_id=request_id,
-                status_code=status_code,
-                response_time=response_time
+                {"request_id": request_id, "status_code": status_code, "response_time": response_time}
             )
             return {"status": "error", "code": status_code}
 
 
 def generate_report(logger: DualTagLogger, data: dict) -> None:
     """Generate a report using multiple modules"""
-    report_id = f"report_{random.randint(10000, 99999)}"
+    report_id = f"report_{_rng.randint(10000, 99999)}"
     
     logger.info(
-        Features.REPORT_GENERATION,
-        Modules.ANALYTICS,
-        "generate_report",
+        *_REPORT_TAGS,
         "Starting report generation",
         report_id=report_id
     )
     
     # Simulate fetching data from database
     logger.debug(
-        Features.REPORT_GENERATION,
-        Modules.DATABASE,
-        "generate_report",
+        *_REPORT_DB_TAGS,
         "Fetching data from database",
         report_id=report_id,
         query="SELECT * FROM metrics"
@@ -294,24 +286,27 @@ def generate_report(logger: DualTagLogger, data: dict) -> None:
     
     # Simulate file generation
     logger.info(
-        Features.REPORT_GENERATION,
-        Modules.FILE_HANDLER,
-        "generate_report",
+        *_REPORT_FILE_TAGS,
         "Writing report to file",
         report_id=report_id,
         filename=f"{report_id}.pdf"
     )
     
     logger.info(
-        Features.REPORT_GENERATION,
-        Modules.ANALYTICS,
-        "generate_report",
+        *_REPORT_TAGS,
         "Report generation completed",
         report_id=report_id,
         duration=0.3
     )
 
 
+def _print_logs(title: str, logs: list, limit: int = 3) -> None:
+    """Print title and the first few logs, indented, in a single write"""
+    lines = [title]
+    lines.extend(f"  {log.to_formatted_string()}" for log in logs[:limit])
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def demonstrate_logging_system():
     """Main demonstration function"""
     
@@ -331,32 +326,42 @@ def demonstrate_logging_system():
     file_manager = FileManager(logger)
     api_client = APIClient(logger)
     
-    # Simulate application flow
-    print("\n1. User Authentication Flow:")
-    auth_service.authenticate_user("admin", "password")
-    auth_service.authenticate_user("user", "wrongpass")
-    auth_service.check_permissions("admin", "/api/users")
+    # Simulate application flow. The flows are independent of each other and
+    # mostly waiting, so they run side by side and the logger sees real concurrency.
+    def auth_flow():
+        auth_service.authenticate_user("admin", "password")
+        auth_service.authenticate_user("user", "wrongpass")
+        auth_service.check_permissions("admin", "/api/users")
     
-    print("\n2. Data Processing Flow:")
-    for i in range(3):
-        try:
-            data_processor.process_data(f"dataset_{i}", 1000 * (i + 1))
-        except:
-            pass
+    def data_flow():
+        for i in range(3):
+            try:
+                data_processor.process_data(f"dataset_{i}", 1000 * (i + 1))
+            except:
+                pass
+    
+    def file_flow():
+        file_manager.save_file("output.txt", "Sample content")
+        file_manager.save_file("report.pdf", "Report data" * 100)
     
-    print("\n3. File Operations Flow:")
-    file_manager.save_file("output.txt", "Sample content")
-    file_manager.save_file("report.pdf", "Report data" * 100)
+    # Distinct request ids, drawn in one go
+    request_ids = [f"req_{n}" for n in _rng.sample(range(1000, 10000), 4)]
     
-    print("\n4. API Calls Flow:")
-    for _ in range(4):
-        api_client.make_request("/api/users", "GET")
+    def api_flow():
+        for request_id in request_ids:
+            api_client.make_request("/api/users", "GET", request_id=request_id)
     
-    print("\n5. Report Generation Flow:")
-    generate_report(logger, {"metric": "value"})
+    def report_flow():
+        generate_report(logger, {"metric": "value"})
     
-    # Wait for all logs to be processed
-    time.sleep(0.5)
+    flows = [auth_flow, data_flow, file_flow, api_flow, report_flow]
+    print("\nRunning the authentication, data processing, file, API and report flows concurrently:")
+    with ThreadPoolExecutor(max_workers=len(flows)) as pool:
+        for future in [pool.submit(flow) for flow in flows]:
+            future.result()
+    
+    # Make sure all logs have been written out
+    logger.flush()
     
     # Demonstrate analysis capabilities
     print("\n\n=== Log Analysis Demonstration ===\n")
@@ -410,22 +415,16 @@ def demonstrate_logging_system():
     
     # Filter by feature
     auth_logs = logger.get_logs_by_feature(Features.USER_AUTH)
-    print(f"\nAuthentication logs ({len(auth_logs)} entries):")
-    for log in auth_logs[:3]:
-        print(f"  {log.to_formatted_string()}")
+    _print_logs(f"\nAuthentication logs ({len(auth_logs)} entries):", auth_logs)
     
     # Filter by module
     db_logs = logger.get_logs_by_module(Modules.DATABASE)
-    print(f"\nDatabase module logs ({len(db_logs)} entries):")
-    for log in db_logs[:3]:
-        print(f"  {log.to_formatted_string()}")
+    _print_logs(f"\nDatabase module logs ({len(db_logs)} entries):", db_logs)
     
     # Custom filter
     error_filter = LogFilter(levels=[LogLevel.ERROR, LogLevel.CRITICAL])
     error_logs = logger.get_filtered_logs(error_filter)
-    print(f"\nError logs ({len(error_logs)} entries):")
-    for log in error_logs[:3]:
-        print(f"  {log.to_formatted_string()}")
+    _print_logs(f"\nError logs ({len(error_logs)} entries):", error_logs)
     
     # 6. Export capabilities
     print("\n\n--- Exporting Logs ---")
@@ -440,11 +439,12 @@ def demonstrate_logging_system():
     
     # Generate full report
     report = analyzer.generate_report(all_logs)
-    with open("analysis_report.json", "w") as f:
-        import json
-        json.dump(report, f, indent=2)
+    with open("analysis_report.json", "w", encoding="utf-8") as f:
+        f.write(dumps_indented(report))
     print("Generated comprehensive analysis report: analysis_report.json")
     
+    logger.close()
+    
     print("\n\n=== Demonstration Complete ===")
 
 
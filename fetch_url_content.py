@@ -7,10 +7,17 @@ Handles various content types and provides robust error handling.
 import sys
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 import logging
+import codecs
 import socket
 import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse
 
 # Configure logging
@@ -67,52 +74,78 @@ def sanitize_url_for_logging(url):
         return "[invalid-url]"
 
 
-def validate_url(url):
+_ALLOWED_SCHEMES = frozenset({'http', 'https'})
+
+# Cloud metadata endpoints, blocked by name
+_BLOCKED_HOSTS = frozenset({
+    'metadata.google.internal',
+    'metadata.azure.com',
+    '169.254.169.254'
+})
+
+
+@lru_cache(maxsize=1024)
+def _parse_url_hostname(url):
     """
-    Validate if the provided string is a valid and safe URL.
+    Do the checks on url that need no network access.
     
-    Args:
-        url (str): URL string to validate
-        
     Returns:
-        tuple: (is_valid, error_message)
+        tuple: (hostname, error_message), hostname being None if url was rejected
     """
-    if not url or not isinstance(url, str):
-        return False, "URL cannot be empty"
-    
     try:
         result = urlparse(url)
         
         # Check scheme
-        if result.scheme not in ['http', 'https']:
-            return False, "Only HTTP(S) URLs are allowed"
+        if result.scheme not in _ALLOWED_SCHEMES:
+            return None, "Only HTTP(S) URLs are allowed"
         
         # Check for netloc
         if not result.netloc:
-            return False, "Invalid URL format"
-        
-        # Check URL length
-        if len(url) > 2048:
-            return False, "URL too long (max 2048 characters)"
+            return None, "Invalid URL format"
         
-        # Extract hostname for SSRF check
+        # Extract hostname for SSRF check (urlparse returns it lowercased)
         hostname = result.hostname
         if not hostname:
-            return False, "Invalid hostname"
+            return None, "Invalid hostname"
         
+        # Check for common metadata endpoints (before the DNS lookup, which they don't need)
+        if hostname in _BLOCKED_HOSTS:
+            return None, "Access to metadata endpoints is not allowed"
+        
+        return hostname, None
+        
+    except Exception as e:
+        return None, f"Invalid URL format: {str(e)}"
+
+
+def validate_url(url):
+    """
+    Validate if the provided string is a valid and safe URL.
+    
+    Args:
+        url (str): URL string to validate
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    if not url or not isinstance(url, str):
+        return False, "URL cannot be empty"
+    
+    # Check URL length before spending any time parsing it
+    if len(url) > 2048:
+        return False, "URL too long (max 2048 characters)"
+    
+    # Parsing is cached per URL; the private IP check below is not, since
+    # what a hostname resolves to can change between calls
+    hostname, error = _parse_url_hostname(url)
+    if error:
+        return False, error
+    
+    try:
         # Check for private IPs (SSRF protection)
         if is_private_ip(hostname):
             return False, "Access to private/internal addresses is not allowed"
         
-        # Check for common metadata endpoints
-        blocked_hosts = [
-            'metadata.google.internal',
-            'metadata.azure.com',
-            '169.254.169.254'
-        ]
-        if hostname.lower() in blocked_hosts:
-            return False, "Access to metadata endpoints is not allowed"
-        
         return True, None
         
     except Exception as e:
@@ -134,6 +167,60 @@ def is_allowed_content_type(content_type):
     return any(allowed in ct_lower for allowed in ALLOWED_CONTENT_TYPES)
 
 
+# Non-text/* MIME types whose bodies are decoded and returned as text
+_TEXTUAL = frozenset({
+    'application/json', 'application/x-json', 'application/json-seq',
+    'application/ndjson', 'application/x-ndjson',
+    'application/xml', 'application/x-xml', 'application/xhtml+xml',
+    'application/javascript', 'application/x-javascript',
+    'application/ecmascript', 'application/x-ecmascript'
+})
+
+
+# One session for every fetch, so keep-alive connections (and their TLS
+# handshakes) are reused across calls instead of rebuilt each time.
+# Built on first use, so importing this module for validate_url costs nothing.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    """Return the shared requests session, creating it on the first call."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (compatible; URLFetcher/1.0)',
+                    # gzip and deflate, plus br/zstd when brotli/zstandard are installed to decode them
+                    'Accept-Encoding': ACCEPT_ENCODING,
+                    'Accept': 'text/html,application/json,application/xml;q=0.9,*/*;q=0.8',
+                    'DNT': '1',
+                    'X-Requested-With': 'URLFetcher',
+                    'Cache-Control': 'no-cache'
+                })
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=32,
+                    # Retry failed connects and transient server errors with backoff; once
+                    # retries run out the last response comes back so raise_for_status reports it.
+                    # Retry-After is ignored, or a server could stall a fetch far past --timeout.
+                    max_retries=Retry(
+                        total=3,
+                        read=False,
+                        backoff_factor=0.2,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        respect_retry_after_header=False,
+                        raise_on_status=False
+                    )
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _SESSION = session
+    return _SESSION
+
+
 def fetch_url_content(url, timeout=30, verify_ssl=True, max_size=10*1024*1024):
     """
     Fetch content from the provided URL.
@@ -155,77 +242,70 @@ def fetch_url_content(url, timeout=30, verify_ssl=True, max_size=10*1024*1024):
     if not verify_ssl:
         logger.warning("SSL verification is disabled - connection may be insecure!")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; URLFetcher/1.0)',
-        'Accept-Encoding': 'gzip, deflate',
-        'Accept': 'text/html,application/json,application/xml;q=0.9,*/*;q=0.8',
-        'DNT': '1',
-        'X-Requested-With': 'URLFetcher',
-        'Cache-Control': 'no-cache'
-    }
-    
     try:
-        # Create session with connection limits
-        session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        
         # Log sanitized URL
         logger.info(f"Fetching content from: {sanitize_url_for_logging(url)}")
         
-        response = session.get(
+        response = _get_session().get(
             url, 
-            headers=headers, 
             timeout=timeout,
             verify=verify_ssl,
             allow_redirects=True,
             stream=True  # Stream to check size before loading
         )
-        response.raise_for_status()
-        
-        # Check content length
-        content_length = response.headers.get('Content-Length')
-        if content_length and int(content_length) > max_size:
+        try:
+            response.raise_for_status()
+            
+            # Check content length
+            content_length = response.headers.get('Content-Length')
+            if content_length and int(content_length) > max_size:
+                raise ValueError(f"Response too large: {int(content_length)} bytes (max: {max_size})")
+            
+            content_type = response.headers.get('Content-Type', 'unknown')
+            logger.debug(f"Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+            
+            # Validate content type for security
+            if not is_allowed_content_type(content_type):
+                logger.warning(f"Potentially unsafe content type: {content_type}")
+            
+            # Text is decoded chunk by chunk as it arrives, so the raw bytes are never
+            # held alongside the decoded string; binary content is only measured
+            mime = content_type.split(';', 1)[0].strip().lower()
+            is_text = mime.startswith('text/') or mime in _TEXTUAL or mime.endswith(('+json', '+xml'))
+            if is_text:
+                encoding = response.encoding or 'utf-8'
+                decoder = codecs.getincrementaldecoder(encoding)()
+            
+            # Read content with size limit
+            text_parts = []
+            total_size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=False):
+                total_size += len(chunk)
+                if total_size > max_size:
+                    raise ValueError(f"Response exceeded size limit: {max_size} bytes")
+                if is_text and text_parts is not None:
+                    try:
+                        text_parts.append(decoder.decode(chunk))
+                    except UnicodeDecodeError:
+                        # Stop decoding but keep reading, so the size limit still applies
+                        text_parts = None
+            if is_text and text_parts is not None:
+                try:
+                    text_parts.append(decoder.decode(b'', final=True))
+                except UnicodeDecodeError:
+                    text_parts = None
+        finally:
             response.close()
-            raise ValueError(f"Response too large: {int(content_length)} bytes (max: {max_size})")
-        
-        # Read content with size limit
-        content_chunks = []
-        total_size = 0
-        for chunk in response.iter_content(chunk_size=8192, decode_unicode=False):
-            total_size += len(chunk)
-            if total_size > max_size:
-                response.close()
-                raise ValueError(f"Response exceeded size limit: {max_size} bytes")
-            content_chunks.append(chunk)
-        
-        content = b''.join(content_chunks)
-        content_type = response.headers.get('Content-Type', 'unknown')
-        
-        # Validate content type for security
-        if not is_allowed_content_type(content_type):
-            logger.warning(f"Potentially unsafe content type: {content_type}")
         
-        logger.info(f"Successfully fetched {len(content)} bytes, Content-Type: {content_type}")
+        logger.info(f"Successfully fetched {total_size} bytes, Content-Type: {content_type}")
         
-        # For text content, decode with error handling
-        if any(t in content_type.lower() for t in ['text', 'json', 'xml', 'html', 'javascript']):
-            try:
-                # Try to detect encoding from Content-Type or use chardet
-                encoding = response.encoding or 'utf-8'
-                text_content = content.decode(encoding)
-                return text_content, content_type, response.status_code
-            except UnicodeDecodeError:
-                logger.warning(f"Failed to decode content as {encoding}, returning as binary")
-                return f"Binary content (failed to decode as text), size: {len(content)} bytes", content_type, response.status_code
-        else:
+        if not is_text:
             # For binary content, return indication of content type and size
-            return f"Binary content ({content_type}), size: {len(content)} bytes", content_type, response.status_code
+            return f"Binary content ({content_type}), size: {total_size} bytes", content_type, response.status_code
+        if text_parts is None:
+            logger.warning(f"Failed to decode content as {encoding}, returning as binary")
+            return f"Binary content (failed to decode as text), size: {total_size} bytes", content_type, response.status_code
+        return ''.join(text_parts), content_type, response.status_code
             
     except requests.exceptions.Timeout:
         logger.error(f"Timeout error: Request timed out after {timeout} seconds")
@@ -256,6 +336,58 @@ def fetch_url_content(url, timeout=30, verify_ssl=True, max_size=10*1024*1024):
         raise
 
 
+
+def fetch_urls_content(urls, timeout=30, verify_ssl=True, max_size=10*1024*1024, max_workers=8):
+    """
+    Fetch several URLs concurrently.
+    
+    The requests spend nearly all their time waiting on the network, so they
+    run on a thread pool and their DNS/connect/transfer times overlap.
+    
+    Args:
+        urls (list): URLs to fetch (already validated)
+        timeout (int): Request timeout in seconds, per URL
+        verify_ssl (bool): Whether to verify SSL certificates
+        max_size (int): Maximum response size in bytes, per URL
+        max_workers (int): Maximum number of requests in flight at once
+        
+    Returns:
+        list: One entry per URL, in the same order: the (content, content_type,
+        status_code) tuple from fetch_url_content, or the exception it raised
+    """
+    def fetch(url):
+        try:
+            return fetch_url_content(url, timeout=timeout, verify_ssl=verify_ssl, max_size=max_size)
+        except Exception as e:
+            return e
+    
+    # A single URL gains nothing from a pool
+    if len(urls) <= 1:
+        return [fetch(url) for url in urls]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(fetch, urls))
+
+
+def report_fetch_error(error, timeout, verbose=False):
+    """Print a user-facing message for an exception raised by fetch_url_content."""
+    if isinstance(error, requests.exceptions.SSLError):
+        print("\nSSL Error: Failed to verify SSL certificate.")
+        print("Use --no-verify-ssl flag if you trust this server (not recommended).")
+    elif isinstance(error, requests.exceptions.Timeout):
+        print(f"\nTimeout Error: Request timed out after {timeout} seconds.")
+    elif isinstance(error, requests.exceptions.ConnectionError):
+        print("\nConnection Error: Failed to connect to the server.")
+    elif isinstance(error, requests.exceptions.HTTPError):
+        print(f"\nHTTP Error: Server returned status code {error.response.status_code}")
+    elif isinstance(error, ValueError):
+        print(f"\nValue Error: {error}")
+    else:
+        print("\nAn unexpected error occurred while fetching the URL.")
+        if verbose:
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+
 def main():
     """Main function to handle command line interface."""
     parser = argparse.ArgumentParser(
@@ -264,15 +396,17 @@ def main():
         epilog='''
 Examples:
   %(prog)s https://example.com
+  %(prog)s https://example.com https://example.org
   %(prog)s https://api.example.com/data --timeout 60
   %(prog)s https://self-signed.example.com --no-verify-ssl
         '''
     )
     
     parser.add_argument(
-        'url',
-        nargs='?',
-        help='URL to fetch content from'
+        'urls',
+        nargs='*',
+        metavar='url',
+        help='URL(s) to fetch content from; several are fetched concurrently'
     )
     parser.add_argument(
         '--timeout',
@@ -315,9 +449,9 @@ Examples:
         sys.exit(1)
     
     # If no URL provided as argument, prompt user
-    if not args.url:
+    if not args.urls:
         try:
-            url = input("Enter URL to fetch: ").strip()
+            urls = [input("Enter URL to fetch: ").strip()]
         except KeyboardInterrupt:
             print("\nOperation cancelled by user")
             sys.exit(0)
@@ -325,30 +459,42 @@ Examples:
             print("\nNo input provided")
             sys.exit(1)
     else:
-        url = args.url
+        urls = args.urls
     
     # Warn about SSL verification if disabled
     if args.no_verify_ssl:
         print("\nWARNING: SSL certificate verification is disabled!")
         print("This makes the connection vulnerable to man-in-the-middle attacks.\n")
     
-    # Validate URL
-    is_valid, error_msg = validate_url(url)
-    if not is_valid:
-        print(f"Error: {error_msg}")
-        if "private" in error_msg or "metadata" in error_msg:
-            print("For security reasons, access to internal/private addresses is blocked.")
-        sys.exit(1)
+    # Validate URLs
+    for url in urls:
+        is_valid, error_msg = validate_url(url)
+        if not is_valid:
+            if len(urls) > 1:
+                print(f"URL: {url}")
+            print(f"Error: {error_msg}")
+            if "private" in error_msg or "metadata" in error_msg:
+                print("For security reasons, access to internal/private addresses is blocked.")
+            sys.exit(1)
     
     # Fetch content
-    try:
-        content, content_type, status_code = fetch_url_content(
-            url,
-            timeout=args.timeout,
-            verify_ssl=not args.no_verify_ssl,
-            max_size=args.max_size
-        )
+    results = fetch_urls_content(
+        urls,
+        timeout=args.timeout,
+        verify_ssl=not args.no_verify_ssl,
+        max_size=args.max_size
+    )
+    
+    failed = False
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            failed = True
+            if len(urls) > 1:
+                print(f"\nURL: {url}")
+            report_fetch_error(result, args.timeout, args.verbose)
+            continue
         
+        content, content_type, status_code = result
         print(f"\n=== URL Content ===")
         print(f"URL: {url}")
         print(f"Status Code: {status_code}")
@@ -357,30 +503,9 @@ Examples:
         print(f"{'='*50}\n")
         
         print(content)
-        
-    except requests.exceptions.SSLError:
-        print("\nSSL Error: Failed to verify SSL certificate.")
-        print("Use --no-verify-ssl flag if you trust this server (not recommended).")
-        sys.exit(1)
-    except requests.exceptions.Timeout:
-        print(f"\nTimeout Error: Request timed out after {args.timeout} seconds.")
-        sys.exit(1)
-    except requests.exceptions.ConnectionError:
-        print("\nConnection Error: Failed to connect to the server.")
-        sys.exit(1)
-    except requests.exceptions.HTTPError as e:
-        print(f"\nHTTP Error: Server returned status code {e.response.status_code}")
-        sys.exit(1)
-    except ValueError as e:
-        print(f"\nValue Error: {e}")
-        sys.exit(1)
-    except Exception:
-        print("\nAn unexpected error occurred while fetching the URL.")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
+    
+    if failed:
         sys.exit(1)
 
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
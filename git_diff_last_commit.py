@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """
 Script to show the differences between the last commit and the previous one.
+
+Other scripts can call get_last_commit_diff() to get the same report as a string.
 """
 
 import subprocess
 import sys
 
 
-def get_git_diff():
-    """Get the diff between the last commit and the previous one."""
+class GitDiffError(Exception):
+    """The diff between the last two commits could not be produced."""
+
+
+def _git_diff_text():
+    """Return the diff between the last commit and the previous one, with its heading."""
     try:
         # Get the diff between HEAD and HEAD~1
         result = subprocess.run(
@@ -17,27 +23,22 @@ def get_git_diff():
             text=True,
             check=True
         )
-        
-        if result.stdout:
-            print("Differences between the last commit and the previous one:")
-            print("-" * 80)
-            print(result.stdout)
-        else:
-            print("No differences found between the last commit and the previous one.")
-            
     except subprocess.CalledProcessError as e:
         if "ambiguous argument 'HEAD~1'" in e.stderr:
-            print("Error: This appears to be the first commit (no previous commit exists).")
-        else:
-            print(f"Git error: {e.stderr}")
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Error: Git is not installed or not in PATH.")
-        sys.exit(1)
+            raise GitDiffError("Error: This appears to be the first commit (no previous commit exists).") from e
+        raise GitDiffError(f"Git error: {e.stderr}") from e
+    except FileNotFoundError as e:
+        raise GitDiffError("Error: Git is not installed or not in PATH.") from e
+    
+    if result.stdout:
+        return ("Differences between the last commit and the previous one:\n"
+                + "-" * 80 + "\n"
+                + result.stdout + "\n")
+    return "No differences found between the last commit and the previous one.\n"
 
 
-def get_commit_info():
-    """Get information about the last two commits."""
+def _commit_info_text():
+    """Return information about the last two commits (or why it is missing)."""
     try:
         # Get info about the last two commits
         result = subprocess.run(
@@ -46,16 +47,43 @@ def get_commit_info():
             text=True,
             check=True
         )
-        
-        if result.stdout:
-            print("\nLast two commits:")
-            print(result.stdout)
-            print()
-            
     except subprocess.CalledProcessError as e:
-        print(f"Error getting commit info: {e.stderr}")
+        return f"Error getting commit info: {e.stderr}\n"
+    except FileNotFoundError as e:
+        raise GitDiffError("Error: Git is not installed or not in PATH.") from e
+    
+    if result.stdout:
+        return f"\nLast two commits:\n{result.stdout}\n\n"
+    return ""
+
+
+def get_last_commit_diff():
+    """
+    Return the report this script prints: the last two commits and the diff between them.
+    
+    Raises GitDiffError if the diff can't be produced.
+    """
+    return _commit_info_text() + _git_diff_text()
+
+
+def get_git_diff():
+    """Get the diff between the last commit and the previous one."""
+    try:
+        print(_git_diff_text(), end='')
+    except GitDiffError as e:
+        print(e)
+        sys.exit(1)
+
+
+def get_commit_info():
+    """Get information about the last two commits."""
+    try:
+        print(_commit_info_text(), end='')
+    except GitDiffError as e:
+        print(e)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     get_commit_info()
-    get_git_diff()
\ No newline at end of file
+    get_git_diff()
@@ -10,7 +10,7 @@ from typing import List, Dict, Any, Optional, Callable, Tuple
 from collections import defaultdict, Counter
 from datetime import datetime
 import json
-import statistics
+import math
 from logger import LogEntry, LogLevel, LogFilter, DualTagLogger
 
 
@@ -96,6 +96,53 @@ class LogAnalyzer:
             grouped[log.function_name].append(log)
         return dict(grouped)
     
+    def _summarize_by(self,
+                      logs: List[LogEntry],
+                      group_attr: str,
+                      related_attr: str,
+                      related_name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize logs grouped by group_attr in a single pass over them
+        
+        related_attr is the other tag to collect for each group, reported
+        under related_name ("modules" for features, "features" for modules).
+        """
+        totals = {}
+        for log in logs:
+            key = getattr(log, group_attr)
+            group = totals.get(key)
+            if group is None:
+                group = totals[key] = {
+                    "count": 0,
+                    "levels": Counter(),
+                    "related": set(),
+                    "functions": set(),
+                    "start": log.timestamp,
+                    "end": log.timestamp
+                }
+            group["count"] += 1
+            group["levels"][log.level.value] += 1
+            group["related"].add(getattr(log, related_attr))
+            group["functions"].add(log.function_name)
+            if log.timestamp < group["start"]:
+                group["start"] = log.timestamp
+            elif log.timestamp > group["end"]:
+                group["end"] = log.timestamp
+        
+        return {
+            key: {
+                "count": group["count"],
+                "levels": dict(group["levels"]),
+                related_name: list(group["related"]),
+                "functions": list(group["functions"]),
+                "time_range": {
+                    "start": datetime.fromtimestamp(group["start"]).isoformat(),
+                    "end": datetime.fromtimestamp(group["end"]).isoformat()
+                }
+            }
+            for key, group in totals.items()
+        }
+    
     def get_feature_summary(self, logs: List[LogEntry]) -> Dict[str, Dict[str, Any]]:
         """
         Get summary statistics for each feature
@@ -107,27 +154,7 @@ class LogAnalyzer:
         - functions: Functions that logged for this feature
         - time_range: First and last log timestamps
         """
-        feature_groups = self.group_by_feature(logs)
-        summary = {}
-        
-        for feature, feature_logs in feature_groups.items():
-            level_counts = Counter(log.level.value for log in feature_logs)
-            modules = list(set(log.module_tag for log in feature_logs))
-            functions = list(set(log.function_name for log in feature_logs))
-            timestamps = [log.timestamp for log in feature_logs]
-            
-            summary[feature] = {
-                "count": len(feature_logs),
-                "levels": dict(level_counts),
-                "modules": modules,
-                "functions": functions,
-                "time_range": {
-                    "start": datetime.fromtimestamp(min(timestamps)).isoformat(),
-                    "end": datetime.fromtimestamp(max(timestamps)).isoformat()
-                } if timestamps else None
-            }
-        
-        return summary
+        return self._summarize_by(logs, "feature_tag", "module_tag", "modules")
     
     def get_module_summary(self, logs: List[LogEntry]) -> Dict[str, Dict[str, Any]]:
         """
@@ -140,27 +167,7 @@ class LogAnalyzer:
         - functions: Functions in this module that logged
         - time_range: First and last log timestamps
         """
-        module_groups = self.group_by_module(logs)
-        summary = {}
-        
-        for module, module_logs in module_groups.items():
-            level_counts = Counter(log.level.value for log in module_logs)
-            features = list(set(log.feature_tag for log in module_logs))
-            functions = list(set(log.function_name for log in module_logs))
-            timestamps = [log.timestamp for log in module_logs]
-            
-            summary[module] = {
-                "count": len(module_logs),
-                "levels": dict(level_counts),
-                "features": features,
-                "functions": functions,
-                "time_range": {
-                    "start": datetime.fromtimestamp(min(timestamps)).isoformat(),
-                    "end": datetime.fromtimestamp(max(timestamps)).isoformat()
-                } if timestamps else None
-            }
-        
-        return summary
+        return self._summarize_by(logs, "module_tag", "feature_tag", "features")
     
     def get_error_analysis(self, logs: List[LogEntry]) -> Dict[str, Any]:
         """
@@ -211,7 +218,7 @@ class LogAnalyzer:
         func_stats = {}
         for func, dur_list in func_durations.items():
             func_stats[func] = {
-                "avg": statistics.mean(dur_list),
+                "avg": math.fsum(dur_list) / len(dur_list),
                 "min": min(dur_list),
                 "max": max(dur_list),
                 "count": len(dur_list),
@@ -220,7 +227,7 @@ class LogAnalyzer:
         
         return {
             "total_operations": len(perf_logs),
-            "avg_duration": statistics.mean(durations),
+            "avg_duration": math.fsum(durations) / len(durations),
             "min_duration": min(durations),
             "max_duration": max(durations),
             "total_duration": sum(durations),
@@ -10,14 +10,27 @@ It allows for flexible sorting and filtering based on these tags.
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Union, Callable, Tuple
 from enum import Enum
 from dataclasses import dataclass, field, asdict
 from collections import defaultdict
 import os
+import sys
 import threading
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_indented(obj: Any) -> str:
+    """Serialize obj to JSON indented by two spaces, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, indent=2)
+
 
 class LogLevel(Enum):
     """Log severity levels"""
@@ -28,6 +41,16 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+# Severity order of the levels, for minimum-level checks
+_LEVEL_VALUES = {
+    LogLevel.DEBUG: 0,
+    LogLevel.INFO: 1,
+    LogLevel.WARNING: 2,
+    LogLevel.ERROR: 3,
+    LogLevel.CRITICAL: 4
+}
+
+
 @dataclass
 class LogEntry:
     """
@@ -41,9 +64,14 @@ class LogEntry:
     function_name: str
     message: str
     parameters: Dict[str, Any] = field(default_factory=dict)
+    args: Tuple[Any, ...] = ()
     thread_id: int = field(default_factory=lambda: threading.get_ident())
     process_id: int = field(default_factory=os.getpid)
     
+    def get_message(self) -> str:
+        """Return the message, %-formatted with its args (done here, only when needed)"""
+        return self.message % self.args if self.args else self.message
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert log entry to dictionary format"""
         return {
@@ -53,7 +81,7 @@ class LogEntry:
             "feature_tag": self.feature_tag,
             "module_tag": self.module_tag,
             "function_name": self.function_name,
-            "message": self.message,
+            "message": self.get_message(),
             "parameters": self.parameters,
             "thread_id": self.thread_id,
             "process_id": self.process_id
@@ -61,7 +89,7 @@ class LogEntry:
     
     def to_json(self) -> str:
         """Convert log entry to JSON string"""
-        return json.dumps(self.to_dict(), indent=2)
+        return dumps_indented(self.to_dict())
     
     def to_formatted_string(self) -> str:
         """Convert to human-readable log format"""
@@ -69,7 +97,7 @@ class LogEntry:
         return (
             f"[{self.formatted_timestamp}] [{self.level.value}] "
             f"[Feature: {self.feature_tag}] [Module: {self.module_tag}] "
-            f"[{self.function_name}] {self.message} | Params: {params_str}"
+            f"[{self.function_name}] {self.get_message()} | Params: {params_str}"
         )
 
 
@@ -166,6 +194,14 @@ class LogHandler:
     def handle(self, entry: LogEntry) -> None:
         """Handle a log entry"""
         raise NotImplementedError
+    
+    def flush(self) -> None:
+        """Push out any output the handler has buffered"""
+        pass
+    
+    def close(self) -> None:
+        """Release any resources held by the handler"""
+        pass
 
 
 class ConsoleLogHandler(LogHandler):
@@ -176,7 +212,12 @@ class ConsoleLogHandler(LogHandler):
     
     def handle(self, entry: LogEntry) -> None:
         """Print log entry to console"""
-        print(self.format_func(entry))
+        # One write per entry, so lines from different threads don't interleave
+        sys.stdout.write(self.format_func(entry) + '\n')
+    
+    def flush(self) -> None:
+        """Flush stdout"""
+        sys.stdout.flush()
 
 
 class FileLogHandler(LogHandler):
@@ -190,24 +231,43 @@ class FileLogHandler(LogHandler):
         self.format_func = format_func or (lambda e: e.to_json())
         self.rotate_size = rotate_size
         self._lock = threading.Lock()
+        # Opened on the first entry and kept open, rather than reopened for each one
+        self._file = None
     
     def handle(self, entry: LogEntry) -> None:
         """Write log entry to file"""
         with self._lock:
-            # Check if rotation is needed
-            if self.rotate_size and self.filepath.exists():
-                if self.filepath.stat().st_size > self.rotate_size:
-                    self._rotate()
+            if self._file is None:
+                self._file = open(self.filepath, 'a', encoding='utf-8')
             
-            # Write the log entry
-            with open(self.filepath, 'a') as f:
-                f.write(self.format_func(entry) + '\n')
+            # Check if rotation is needed (in append mode the position is the file size)
+            if self.rotate_size and self._file.tell() > self.rotate_size:
+                self._rotate()
+            
+            # Write the log entry; flushed right away so the file is always current
+            self._file.write(self.format_func(entry) + '\n')
+            self._file.flush()
     
     def _rotate(self) -> None:
         """Rotate log file"""
+        self._file.close()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         new_name = f"{self.filepath.stem}_{timestamp}{self.filepath.suffix}"
         self.filepath.rename(self.filepath.parent / new_name)
+        self._file = open(self.filepath, 'a', encoding='utf-8')
+    
+    def flush(self) -> None:
+        """Flush the log file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+    
+    def close(self) -> None:
+        """Close the log file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
 
 
 class DualTagLogger:
@@ -234,14 +294,7 @@ class DualTagLogger:
     
     def _should_log(self, level: LogLevel) -> bool:
         """Check if we should log at this level"""
-        level_values = {
-            LogLevel.DEBUG: 0,
-            LogLevel.INFO: 1,
-            LogLevel.WARNING: 2,
-            LogLevel.ERROR: 3,
-            LogLevel.CRITICAL: 4
-        }
-        return level_values[level] >= level_values[self._min_level]
+        return _LEVEL_VALUES[level] >= _LEVEL_VALUES[self._min_level]
     
     def log(self,
             level: LogLevel,
@@ -249,7 +302,8 @@ class DualTagLogger:
             module_tag: str,
             function_name: str,
             message: str,
-            parameters: Optional[Dict[str, Any]] = None) -> None:
+            parameters: Optional[Dict[str, Any]] = None,
+            args: Tuple[Any, ...] = ()) -> None:
         """
         Create a log entry with all required information
         
@@ -258,8 +312,10 @@ class DualTagLogger:
             feature_tag: User-facing feature this log relates to
             module_tag: Internal module this log belongs to
             function_name: Name of the function generating the log
-            message: Log message
+            message: Log message, a %-format template when args are given
             parameters: Dictionary of parameters and their values
+            args: Values for the message template; it is only formatted when
+                the entry is output, so filtered-out entries never pay for it
         """
         if not self._should_log(level):
             return
@@ -275,7 +331,8 @@ class DualTagLogger:
             module_tag=module_tag,
             function_name=function_name,
             message=message,
-            parameters=parameters or {}
+            parameters=parameters or {},
+            args=args
         )
         
         # Store the entry
@@ -289,30 +346,62 @@ class DualTagLogger:
                 # Log handler errors shouldn't crash the application
                 print(f"Error in log handler: {e}")
     
+    def log_tagged(self,
+                   level: LogLevel,
+                   tags: Tuple[str, str, str],
+                   message: str,
+                   parameters: Optional[Dict[str, Any]] = None,
+                   args: Tuple[Any, ...] = ()) -> None:
+        """
+        Log with a prebuilt (feature_tag, module_tag, function_name) tuple
+        
+        For hot call sites: the tags tuple can be a module-level constant and
+        parameters a ready-made dict, so no **params dict is built per call.
+        """
+        if not self._should_log(level):
+            return
+        feature_tag, module_tag, function_name = tags
+        self.log(level, feature_tag, module_tag, function_name, message, parameters, args)
+    
     def debug(self, feature_tag: str, module_tag: str, function_name: str,
-              message: str, **params) -> None:
+              message: str, *args, **params) -> None:
         """Log debug message"""
-        self.log(LogLevel.DEBUG, feature_tag, module_tag, function_name, message, params)
+        self.log(LogLevel.DEBUG, feature_tag, module_tag, function_name, message, params, args)
     
     def info(self, feature_tag: str, module_tag: str, function_name: str,
-             message: str, **params) -> None:
+             message: str, *args, **params) -> None:
         """Log info message"""
-        self.log(LogLevel.INFO, feature_tag, module_tag, function_name, message, params)
+        self.log(LogLevel.INFO, feature_tag, module_tag, function_name, message, params, args)
     
     def warning(self, feature_tag: str, module_tag: str, function_name: str,
-                message: str, **params) -> None:
+                message: str, *args, **params) -> None:
         """Log warning message"""
-        self.log(LogLevel.WARNING, feature_tag, module_tag, function_name, message, params)
+        self.log(LogLevel.WARNING, feature_tag, module_tag, function_name, message, params, args)
     
     def error(self, feature_tag: str, module_tag: str, function_name: str,
-              message: str, **params) -> None:
+              message: str, *args, **params) -> None:
         """Log error message"""
-        self.log(LogLevel.ERROR, feature_tag, module_tag, function_name, message, params)
+        self.log(LogLevel.ERROR, feature_tag, module_tag, function_name, message, params, args)
     
     def critical(self, feature_tag: str, module_tag: str, function_name: str,
-                 message: str, **params) -> None:
+                 message: str, *args, **params) -> None:
         """Log critical message"""
-        self.log(LogLevel.CRITICAL, feature_tag, module_tag, function_name, message, params)
+        self.log(LogLevel.CRITICAL, feature_tag, module_tag, function_name, message, params, args)
+    
+    def flush(self) -> None:
+        """
+        Flush all handlers
+        
+        Entries are handled synchronously as they are logged, so once this
+        returns everything logged so far has been written out.
+        """
+        for handler in self.handlers:
+            handler.flush()
+    
+    def close(self) -> None:
+        """Close all handlers"""
+        for handler in self.handlers:
+            handler.close()
     
     def get_logs_by_feature(self, feature_tag: str) -> List[LogEntry]:
         """Get all logs for a specific feature"""
@@ -344,10 +433,12 @@ class DualTagLogger:
         """
         logs = self.storage.filter(log_filter) if log_filter else self.storage.get_all()
         
-        with open(filepath, 'w') as f:
+        with open(filepath, 'w', encoding='utf-8') as f:
             if format_type == "json":
                 log_dicts = [log.to_dict() for log in logs]
-                json.dump(log_dicts, f, indent=2)
+                # Encode in one go and hand it over in a single write, instead of
+                # json.dump's stream of small writes
+                f.write(dumps_indented(log_dicts))
             elif format_type == "csv":
                 import csv
                 if logs:
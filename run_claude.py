@@ -9,10 +9,16 @@ import subprocess
 import sys
 import os
 import platform
+import shutil
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
 
+# Resolved once; on Windows this finds claude.cmd through PATHEXT, so we can
+# run it without starting cmd.exe to search PATH on every call
+_CLAUDE_PATH = shutil.which('claude')
+
+
 def setup_claude_environment():
     """Set up CLAUDE_CODE_GIT_BASH_PATH if not already set."""
     if 'CLAUDE_CODE_GIT_BASH_PATH' in os.environ:
@@ -60,7 +66,7 @@ def run_claude_windows(prompt, skip_permissions=False, timeout=300):
         return "", -1
     
     # Build command
-    cmd = ['claude', '--print']
+    cmd = [_CLAUDE_PATH or 'claude', '--print']
     if skip_permissions:
         cmd.append('--dangerously-skip-permissions')
     cmd.append(prompt)
@@ -73,7 +79,7 @@ def run_claude_windows(prompt, skip_permissions=False, timeout=300):
             text=True,
             timeout=timeout,
             env=os.environ,  # Use the modified environment
-            shell=True  # Use shell to ensure PATH is resolved
+            shell=_CLAUDE_PATH is None  # Not found up front: let the shell search PATH
         )
         
         return result.stdout, result.returncode
@@ -87,7 +93,7 @@ def run_claude_windows(prompt, skip_permissions=False, timeout=300):
 
 def run_claude_unix(prompt, skip_permissions=False, timeout=300):
     """Run Claude on Unix-like systems."""
-    cmd = ['claude', '--print']
+    cmd = [_CLAUDE_PATH or 'claude', '--print']
     if skip_permissions:
         cmd.append('--dangerously-skip-permissions')
     cmd.append(prompt)
@@ -6,11 +6,10 @@ instead of opening a new terminal window.
 
 import sys
 import os
+import stat
+import asyncio
 import subprocess
 import click
-import shlex
-from pathlib import Path
-import time
 import tempfile
 import json
 
@@ -22,55 +21,89 @@ def run_claude_direct(path, input_string, wait_time=5, capture=True):
     Returns:
         dict: Contains 'stdout', 'stderr', 'returncode', and 'success' keys
     """
-    # Validate path
-    path_obj = Path(path)
-    if not path_obj.exists():
+    # Validate path with a single stat() call
+    try:
+        st = os.stat(path)
+    except OSError:
         return {
             'stdout': '',
             'stderr': f"Error: Path '{path}' does not exist",
             'returncode': 1,
             'success': False
         }
+    if not stat.S_ISDIR(st.st_mode):
+        return {
+            'stdout': '',
+            'stderr': f"Error: Path '{path}' is not a directory",
+            'returncode': 1,
+            'success': False
+        }
     
     # Full path to claude
     claude_path = "/home/laurelin/.npm-global/bin/claude"
     
-    # Change to the specified directory and run claude
-    cmd = f"cd {shlex.quote(str(path_obj))} && echo {shlex.quote(input_string)} | {claude_path}"
-    
-    if capture:
-        # Run with output capture
-        process = subprocess.Popen(
-            cmd,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # Add a small delay to let Claude initialize
-        time.sleep(wait_time)
-        
-        # Get output
-        stdout, stderr = process.communicate()
-        
-        return {
-            'stdout': stdout,
-            'stderr': stderr,
-            'returncode': process.returncode,
-            'success': process.returncode == 0
-        }
-    else:
-        # Run without capture (interactive mode)
-        process = subprocess.Popen(cmd, shell=True)
-        process.wait()
-        
+    try:
+        if capture:
+            # Run with output capture
+            stdout, stderr, returncode = asyncio.run(
+                _run_claude_captured(claude_path, path, input_string, wait_time))
+        else:
+            # Run without capture (interactive mode)
+            process = subprocess.Popen([claude_path], cwd=path, stdin=subprocess.PIPE)
+            process.stdin.write(input_string.encode('utf-8') + b'\n')
+            process.stdin.close()
+            stdout, stderr, returncode = '', '', process.wait()
+    except OSError as e:
         return {
             'stdout': '',
-            'stderr': '',
-            'returncode': process.returncode,
-            'success': process.returncode == 0
+            'stderr': f"Error: Could not run {claude_path}: {e}",
+            'returncode': 127,
+            'success': False
         }
+    
+    return {
+        'stdout': stdout,
+        'stderr': stderr,
+        'returncode': returncode,
+        'success': returncode == 0
+    }
+
+
+async def _run_claude_captured(claude_path, cwd, input_string, wait_time):
+    """
+    Run claude in cwd, sending input_string after wait_time seconds.
+    
+    stdout and stderr are drained concurrently the whole time, so a chatty
+    stderr can't fill its pipe and stall claude while we wait on stdout.
+    
+    Returns:
+        tuple: (stdout, stderr, returncode)
+    """
+    process = await asyncio.create_subprocess_exec(
+        claude_path,
+        cwd=cwd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    async def send_input():
+        # Add a small delay to let Claude initialize
+        await asyncio.sleep(wait_time)
+        process.stdin.write(input_string.encode('utf-8') + b'\n')
+        try:
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Claude exited before reading its input
+        process.stdin.close()
+    
+    _, stdout, stderr = await asyncio.gather(
+        send_input(), process.stdout.read(), process.stderr.read())
+    returncode = await process.wait()
+    
+    return (stdout.decode('utf-8', errors='replace'),
+            stderr.decode('utf-8', errors='replace'),
+            returncode)
 
 
 @click.command()
@@ -7,6 +7,7 @@ Uses Windows Terminal's command execution instead of keyboard automation.
 import sys
 import os
 import subprocess
+import functools
 import click
 import shlex
 from pathlib import Path
@@ -14,11 +15,13 @@ import time
 import tempfile
 
 
+@functools.lru_cache(maxsize=256)
 def convert_wsl_path(linux_path):
     """Convert WSL Linux path to Windows path format."""
     try:
-        result = subprocess.run(['wslpath', '-w', linux_path], 
-                              capture_output=True, text=True, check=True)
+        # Only stdout is needed, and the short-lived child inherits nothing worth closing
+        result = subprocess.run(['wslpath', '-w', linux_path], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True, close_fds=False)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         return linux_path
@@ -81,11 +84,8 @@ def main(path, input_string, method, wait_time, verbose, keep_open):
         python run_claude_wsl.py --wait-time 10 /path "Input"
     """
     
-    # Validate path
+    # click.Path has already checked that path exists and is a directory
     path_obj = Path(path)
-    if not path_obj.exists():
-        click.echo(f"Error: Path '{path}' does not exist", err=True)
-        sys.exit(1)
     
     # Check if running in WSL
     if not os.path.exists("/proc/sys/fs/binfmt_misc/WSLInterop"):